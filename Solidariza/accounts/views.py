@@ -2,7 +2,7 @@ from django.contrib.auth import authenticate, login
 from django.contrib.auth.views import LoginView
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from core.models import Organization
+from core.directory import find_organization, list_organizations
 
 
 class CustomLoginView(LoginView):
@@ -12,7 +12,7 @@ class CustomLoginView(LoginView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Adicionar lista de organizações ativas para o dropdown
-        context['organizations'] = Organization.objects.filter(is_active=True).order_by('name')
+        context['organizations'] = list_organizations(active_only=True)
         return context
     
     def form_invalid(self, form):
@@ -36,12 +36,9 @@ class CustomLoginView(LoginView):
             if user.is_superuser:
                 login(self.request, user)
                 # Se selecionou uma organização específica, definir como organização ativa
-                if selected_org_id:
-                    try:
-                        selected_org = Organization.objects.get(id=selected_org_id, is_active=True)
-                        self.request.session['active_organization_id'] = selected_org.id
-                    except Organization.DoesNotExist:
-                        pass
+                selected_org = find_organization(selected_org_id, active_only=True) if selected_org_id else None
+                if selected_org:
+                    self.request.session['active_organization_id'] = selected_org.id
                 return redirect('panel:dashboard')
             
             # Para usuários não-superusuários, a seleção de organização é obrigatória
@@ -49,13 +46,12 @@ class CustomLoginView(LoginView):
                 messages.error(self.request, 'Selecione a organização vinculada ao seu usuário para entrar.')
                 return self.form_invalid(form)
 
-            try:
-                selected_org = Organization.objects.get(id=selected_org_id, is_active=True)
-            except Organization.DoesNotExist:
+            selected_org = find_organization(selected_org_id, active_only=True)
+            if selected_org is None:
                 messages.error(self.request, 'Organização não encontrada.')
                 return self.form_invalid(form)
 
-            if user.organization != selected_org:
+            if user.organization_id != selected_org.id:
                 messages.error(self.request, 'Você não tem permissão para acessar esta organização.')
                 return self.form_invalid(form)
 
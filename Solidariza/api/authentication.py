@@ -0,0 +1,37 @@
+"""Autenticação da API por token (`Authorization: Token <chave>` ou `Bearer <chave>`).
+
+Substitui a BasicAuthentication, que rodava o hash de senha (PBKDF2) a cada
+requisição. A verificação está em core.tokens.
+"""
+
+from __future__ import annotations
+
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from core.tokens import resolve_token
+
+
+KEYWORDS = (b"token", b"bearer")
+
+
+class ApiTokenAuthentication(BaseAuthentication):
+    keyword = "Token"
+
+    def authenticate(self, request):
+        parts = get_authorization_header(request).split()
+        if not parts or parts[0].lower() not in KEYWORDS:
+            return None
+        if len(parts) != 2:
+            raise exceptions.AuthenticationFailed("Cabeçalho de token inválido.")
+        try:
+            raw = parts[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed("Cabeçalho de token inválido.")
+        resolved = resolve_token(raw)
+        if resolved is None:
+            raise exceptions.AuthenticationFailed("Token inválido, expirado ou revogado.")
+        return resolved
+
+    def authenticate_header(self, request):
+        return self.keyword
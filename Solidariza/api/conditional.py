@@ -0,0 +1,77 @@
+"""GET condicional (ETag) nas listas e detalhes da API.
+
+A ETag sai de um agregado barato sobre o mesmo queryset da resposta
+(`COUNT` + `MAX(updated_at)`, incluindo o `updated_at` das relações
+expandidas), sem serializar nada: inclusões e alterações movem o máximo e
+exclusões mudam a contagem. Ela também leva a URL completa (cursor, fields,
+expand...), o formato negociado e a ONG do usuário, então cada
+página/variação tem a sua. Com `If-None-Match` batendo, a resposta é um 304
+sem corpo.
+
+Não há `Last-Modified`: excluir ou desvincular um registro não move o
+`MAX(updated_at)`, e um `If-Modified-Since` daria 304 com a lista já diferente.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+from .fieldsets import serializer_columns
+
+
+UPDATED_FIELD = "updated_at"
+
+
+def _has_updated_field(model, path: str) -> bool:
+    try:
+        for name in path.split("__"):
+            model = model._meta.get_field(name).related_model
+        model._meta.get_field(UPDATED_FIELD)
+    except (FieldDoesNotExist, AttributeError):
+        return False
+    return True
+
+
+class ConditionalGetMixin:
+    # Outros carimbos de data que afetam o resultado (ex.: vínculos com a ONG)
+    extra_stamp_fields: list[str] = []
+
+    def change_stamp(self, queryset) -> tuple:
+        """Validadores (contagem e últimas alterações) do resultado de `queryset`."""
+        related, _columns = serializer_columns(self.get_serializer())
+        aggregates = {"count": Count("pk", distinct=True), "last": Max(UPDATED_FIELD)}
+        for path in related:
+            if _has_updated_field(queryset.model, path):
+                aggregates[path] = Max(f"{path}__{UPDATED_FIELD}")
+        for field in self.extra_stamp_fields:
+            aggregates[field] = Max(field)
+        return tuple(queryset.order_by().aggregate(**aggregates).values())
+
+    def _etag(self, request, *parts) -> str:
+        # o formato negociado (JSON, MessagePack...) também distingue a representação
+        accepted = getattr(request, "accepted_media_type", "")
+        raw = "|".join(str(part) for part in (request.get_full_path(), accepted, request.user.organization_id, *parts))
+        return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+    def _conditional(self, request, etag, respond):
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        response = respond()
+        if response.status_code == 200:
+            response["ETag"] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        etag = self._etag(request, *self.change_stamp(self.get_queryset()))
+        return self._conditional(request, etag, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = self._etag(request, *self.change_stamp(self.get_queryset().filter(pk=instance.pk)))
+        return self._conditional(request, etag, lambda: Response(self.get_serializer(instance).data))
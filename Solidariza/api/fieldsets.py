@@ -0,0 +1,70 @@
+"""Campos esparsos na API (`?fields=` e `?expand=`).
+
+- `?fields=id,name,identifier`: devolve só esses campos;
+- `?expand=beneficiary`: inclui relações aninhadas, que por padrão ficam de fora
+  (declaradas em `Meta.expandable` do serializer).
+
+Nas leituras o queryset é reduzido às colunas que o serializer vai usar
+(`.only()`), com `select_related` apenas das relações expandidas.
+"""
+
+from __future__ import annotations
+
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _query_list(request, name: str) -> list[str] | None:
+    raw = request.query_params.get(name) if request is not None else None
+    if not raw:
+        return None
+    return [part.strip() for part in raw.split(",") if part.strip()]
+
+
+class SparseFieldsSerializerMixin:
+    """Remove do serializer os campos não pedidos e as relações não expandidas."""
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        expand = set(expand or ())
+        for name in getattr(self.Meta, "expandable", ()):
+            if name not in expand:
+                self.fields.pop(name, None)
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def serializer_columns(serializer, prefix: str = "") -> tuple[list[str], list[str]]:
+    """(select_related, only) necessários para serializar os campos de leitura."""
+    related, columns = [], []
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+        path = f"{prefix}{field.source.replace('.', '__')}"
+        if isinstance(field, serializers.BaseSerializer):
+            related.append(path)
+            nested_related, nested_columns = serializer_columns(field, f"{path}__")
+            related.extend(nested_related)
+            columns.extend(nested_columns)
+        else:
+            columns.append(path)
+    return related, columns
+
+
+class SparseFieldsViewMixin:
+    """Para viewsets: repassa `fields`/`expand` ao serializer e enxuga o queryset."""
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", _query_list(self.request, "fields"))
+        kwargs.setdefault("expand", _query_list(self.request, "expand"))
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        related, columns = serializer_columns(self.get_serializer())
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(queryset.model._meta.pk.name, *columns)
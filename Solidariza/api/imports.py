@@ -0,0 +1,152 @@
+"""Importação em massa de beneficiários (NDJSON ou CSV).
+
+O corpo é lido linha a linha e processado em lotes de `IMPORT_BATCH_SIZE`:
+
+1. cada linha é validada pelo serializer (sem o validador de unicidade, que
+   faria uma consulta por linha) e tem o identificador normalizado;
+2. identificadores repetidos no próprio arquivo viram erro na linha repetida;
+3. os já cadastrados na rede são achados com uma consulta `IN` por lote e
+   apenas vinculados à ONG;
+4. os novos entram com `bulk_create`, e os vínculos `OrganizationBeneficiary`
+   que ainda não existem também; o lote entra na sequência de alterações da
+   ONG (core.changes).
+
+O resumo conta o que de fato foi gravado: `created` são os cadastros que
+passaram a existir no lote e `linked` os beneficiários já cadastrados que
+ganharam vínculo com a ONG (quem já era vinculado não conta). Os erros são
+listados até `IMPORT_MAX_ERRORS`; `error_count` traz o total.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from functools import partial
+from itertools import islice
+from typing import Iterable, Iterator
+
+from django.db import transaction
+from rest_framework import serializers
+
+from core.changes import BENEFICIARY, record_changes
+from core.models import Beneficiary, FamilyMember, OrganizationBeneficiary
+from core.validators import normalize_identifier
+from panel.fragments import FAMILY, invalidate_rows
+from .serializers import BeneficiarySerializer
+
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_ERRORS = 100
+
+
+class BeneficiaryImportSerializer(BeneficiarySerializer):
+    class Meta(BeneficiarySerializer.Meta):
+        # unicidade resolvida em lote (ver import_beneficiaries)
+        extra_kwargs = {"identifier": {"validators": []}}
+
+
+def _decoded(lines: Iterable[bytes]) -> Iterator[str]:
+    first = True
+    for raw in lines:
+        line = raw.decode("utf-8")
+        if first:
+            line = line.lstrip("\ufeff")
+            first = False
+        yield line
+
+
+def ndjson_records(lines: Iterable[bytes]) -> Iterator[tuple[int, dict | None, str]]:
+    """(número da linha, registro ou None, erro de leitura)."""
+    for number, line in enumerate(_decoded(lines), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield number, None, f"JSON inválido: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "Cada linha deve ser um objeto JSON."
+            continue
+        yield number, record, ""
+
+
+def csv_records(lines: Iterable[bytes]) -> Iterator[tuple[int, dict | None, str]]:
+    reader = csv.DictReader(_decoded(lines))
+    for record in reader:
+        # linha 1 é o cabeçalho
+        yield reader.line_num, {k: v for k, v in record.items() if k and v not in (None, "")}, ""
+
+
+def import_beneficiaries(records: Iterable[tuple[int, dict | None, str]], *, organization_id: int) -> dict:
+    summary = {"created": 0, "linked": 0, "error_count": 0, "errors_truncated": False, "errors": []}
+    seen: dict[str, int] = {}
+    records = iter(records)
+    while True:
+        batch = list(islice(records, IMPORT_BATCH_SIZE))
+        if not batch:
+            return summary
+        _import_batch(batch, organization_id, seen, summary)
+
+
+def _add_error(summary: dict, error: dict) -> None:
+    summary["error_count"] += 1
+    if len(summary["errors"]) < IMPORT_MAX_ERRORS:
+        summary["errors"].append(error)
+    else:
+        summary["errors_truncated"] = True
+
+
+def _import_batch(batch, organization_id: int, seen: dict, summary: dict) -> None:
+    # Uma instância só: montar os campos de um ModelSerializer custa mais que validar a linha
+    serializer = BeneficiaryImportSerializer()
+    valid = {}
+    for number, record, error in batch:
+        if error:
+            _add_error(summary, {"line": number, "errors": {"non_field_errors": [error]}})
+            continue
+        if "identifier" in record:
+            record["identifier"] = normalize_identifier(str(record["identifier"] or ""))
+        try:
+            data = serializer.run_validation(record)
+        except serializers.ValidationError as exc:
+            _add_error(summary, {"line": number, "identifier": record.get("identifier"), "errors": exc.detail})
+            continue
+        identifier = data["identifier"]
+        if identifier in seen:
+            _add_error(summary, {
+                "line": number,
+                "identifier": identifier,
+                "errors": {"identifier": [f"Duplicado no arquivo (linha {seen[identifier]})."]},
+            })
+            continue
+        seen[identifier] = number
+        valid[identifier] = data
+    if not valid:
+        return
+
+    with transaction.atomic():
+        identifiers = list(valid)
+        existing = dict(Beneficiary.objects.filter(identifier__in=identifiers).values_list("identifier", "id"))
+        new = [Beneficiary(**data) for identifier, data in valid.items() if identifier not in existing]
+        # ignore_conflicts cobre cadastros concorrentes com o mesmo identificador
+        Beneficiary.objects.bulk_create(new, ignore_conflicts=True)
+        ids = set(Beneficiary.objects.filter(identifier__in=identifiers).values_list("id", flat=True))
+        already_linked = set(
+            OrganizationBeneficiary.objects.filter(organization_id=organization_id, beneficiary_id__in=ids)
+            .values_list("beneficiary_id", flat=True)
+        )
+        to_link = ids - already_linked
+        OrganizationBeneficiary.objects.bulk_create(
+            [OrganizationBeneficiary(organization_id=organization_id, beneficiary_id=pk) for pk in to_link],
+            ignore_conflicts=True,
+        )
+        # bulk_create não dispara sinais: registra o lote na sequência de alterações (core.changes)
+        record_changes([organization_id], BENEFICIARY, list(ids))
+        # e invalida as linhas das famílias dos novos vínculos, que mostram as ONGs dos membros (panel.signals)
+        families = set(FamilyMember.objects.filter(beneficiary_id__in=to_link).values_list("family_id", flat=True))
+        if families:
+            transaction.on_commit(partial(invalidate_rows, FAMILY, list(families)))
+    # recontados depois da gravação: o que o bulk_create pulou não entra como criado
+    summary["created"] += len(ids - set(existing.values()))
+    summary["linked"] += len(to_link.intersection(existing.values()))
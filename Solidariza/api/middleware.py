@@ -0,0 +1,13 @@
+from django.middleware.gzip import GZipMiddleware
+
+
+class ApiGZipMiddleware(GZipMiddleware):
+    """Compressão gzip negociada (Accept-Encoding) apenas para as respostas da API.
+
+    As páginas HTML ficam de fora para não expor o token CSRF a ataques do tipo BREACH.
+    """
+
+    def process_response(self, request, response):
+        if not request.path.startswith("/api/"):
+            return response
+        return super().process_response(request, response)
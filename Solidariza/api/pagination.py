@@ -0,0 +1,14 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ApiCursorPagination(CursorPagination):
+    """Paginação por cursor padrão da API (`?cursor=`, `?page_size=` até o máximo).
+
+    Ordena pelo id decrescente: único e indexado, então cada página é uma
+    busca por faixa de chave, com custo constante em qualquer profundidade.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = "-id"
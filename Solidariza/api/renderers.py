@@ -0,0 +1,81 @@
+"""Renderers e parsers rápidos para a API.
+
+- JSON: usa orjson quando instalado (bem mais rápido que o `json` da stdlib,
+  usado pelo JSONRenderer do DRF) e cai no renderer/parser do DRF sem ele.
+  Tipos que o orjson não trata nativamente (Decimal, datas, lazy strings...)
+  passam pelo encoder do DRF, então a saída é a mesma nos dois casos.
+- MessagePack (`application/msgpack`, ou `?format=msgpack`): para os nossos
+  clientes, quando o pacote `msgpack` está instalado (ver REST_FRAMEWORK nas
+  settings).
+"""
+
+from __future__ import annotations
+
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dependência opcional
+    msgpack = None
+
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Datas ficam com o encoder do DRF (milissegundos, "Z" em UTC), igual ao JSONRenderer
+_ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+_encode_default = JSONEncoder().default
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        options = _ORJSON_OPTIONS
+        if self.get_indent(accepted_media_type or "", renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_encode_default, option=options)
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    media_type = MSGPACK_MEDIA_TYPE
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_encode_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except Exception as exc:  # noqa: BLE001 - msgpack levanta vários tipos
+            raise ParseError(f"MessagePack parse error - {exc}")
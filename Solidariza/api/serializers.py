@@ -1,9 +1,10 @@
 from rest_framework import serializers
 
-from core.models import Beneficiary, Distribution, Product
+from core.models import AuditLog, Beneficiary, Distribution, Product
+from .fieldsets import SparseFieldsSerializerMixin
 
 
-class BeneficiarySerializer(serializers.ModelSerializer):
+class BeneficiarySerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Beneficiary
         fields = [
@@ -24,11 +25,10 @@ class BeneficiarySerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class DistributionSerializer(serializers.ModelSerializer):
+class DistributionSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    # dados do beneficiário só com ?expand=beneficiary
     beneficiary = BeneficiarySerializer(read_only=True)
-    beneficiary_id = serializers.PrimaryKeyRelatedField(
-        queryset=Beneficiary.objects.all(), source="beneficiary", write_only=True
-    )
+    beneficiary_id = serializers.PrimaryKeyRelatedField(queryset=Beneficiary.objects.all(), source="beneficiary")
     product_id = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all(), source="product")
 
     class Meta:
@@ -41,5 +41,25 @@ class DistributionSerializer(serializers.ModelSerializer):
             "period_month",
             "delivered_at",
         ]
+        expandable = ["beneficiary"]
 
 
+class AuditLogSerializer(serializers.ModelSerializer):
+    user = serializers.CharField(source="user.username", default=None, read_only=True)
+    organization = serializers.CharField(source="organization.name", default=None, read_only=True)
+
+    class Meta:
+        model = AuditLog
+        fields = [
+            "id",
+            "created_at",
+            "user_id",
+            "user",
+            "organization_id",
+            "organization",
+            "action",
+            "model_name",
+            "object_id",
+            "description",
+            "ip_address",
+        ]
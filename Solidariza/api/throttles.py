@@ -0,0 +1,200 @@
+"""Limite de requisições da API por balde de fichas (token bucket).
+
+Cada balde tem capacidade `burst` e é reabastecido a `rate` (ex.: "120/min").
+Uma requisição consome uma ficha; sem ficha, a resposta é 429 com
+`Retry-After` (tempo até a próxima ficha). Os throttles do DRF rodam depois
+da autenticação e antes do handler, então nenhuma consulta da view é feita.
+
+Com o cache padrão no Redis (`REDIS_URL`), cada balde é um hash no Redis
+atualizado por um script Lua (ler, reabastecer e consumir numa operação
+atômica): o limite vale para todos os workers juntos. Os demais backends não
+têm operação atômica compartilhada (no FileBasedCache, `incr` é get + set) e
+o LocMemCache nem é compartilhado; neles, e se o Redis falhar, o balde vive
+na memória do worker, sob um lock do processo, com `rate` e `burst` divididos
+por `API_THROTTLE_WORKERS` para o total ficar próximo do configurado.
+Recusas são contadas por escopo no cache (ver `throttle_hits`, exposto em
+/api/metrics/throttles/).
+"""
+
+from __future__ import annotations
+
+import abc
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.throttling import BaseThrottle
+
+
+logger = logging.getLogger(__name__)
+
+BUCKET_PREFIX = "api_throttle"
+HITS_PREFIX = "api_throttle_hits"
+
+DEFAULT_BUCKETS = {
+    "user": {"rate": "120/min", "burst": 60},
+    "org": {"rate": "600/min", "burst": 200},
+    "deliver": {"rate": "30/min", "burst": 10},
+}
+
+# Acima disso, baldes já cheios (sem uso há capacity/rate segundos) são descartados
+MAX_LOCAL_BUCKETS = 10000
+
+_lock = threading.Lock()
+_local_buckets: dict[str, tuple[float, float, float]] = {}
+_local_hits: dict[str, int] = {}
+
+# Balde de fichas atômico no Redis: KEYS[1] = balde; ARGV = rate, capacity, now, ttl.
+# Devolve a espera em segundos como texto (números do Lua viram inteiros no retorno).
+_TAKE_TOKEN_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local last = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+return tostring(wait)
+"""
+
+_PERIODS = {"s": 1, "sec": 1, "m": 60, "min": 60, "h": 3600, "hour": 3600, "d": 86400, "day": 86400}
+
+
+def parse_rate(rate: str) -> float:
+    """"120/min" -> fichas por segundo."""
+    count, period = rate.split("/")
+    return int(count) / _PERIODS[period.strip().lower()]
+
+
+def bucket_config(scope: str) -> tuple[float, float]:
+    """(fichas por segundo, capacidade) do balde de `scope`, somando todos os workers."""
+    config = {**DEFAULT_BUCKETS, **getattr(settings, "API_THROTTLE_BUCKETS", {})}[scope]
+    return parse_rate(config["rate"]), float(config["burst"])
+
+
+def _prune(now: float) -> None:
+    for key in [key for key, (_tokens, last, full_at) in _local_buckets.items() if full_at <= now]:
+        del _local_buckets[key]
+
+
+def _take_shared(key: str, rate: float, capacity: float, now: float) -> float | None:
+    """Consome a ficha no Redis; None se o cache não é Redis ou está fora do ar."""
+    backend = caches["default"]
+    if not isinstance(backend, RedisCache):
+        return None
+    key = backend.make_and_validate_key(key)
+    try:
+        client = backend._cache.get_client(key, write=True)
+        script = client.register_script(_TAKE_TOKEN_LUA)
+        # sem requisições, o balde enche em capacity/rate segundos; depois disso a chave é dispensável
+        return float(script(keys=[key], args=[rate, capacity, now, int(capacity / rate) + 1]))
+    except Exception:
+        logger.warning("Throttle sem Redis; usando o balde local do worker", exc_info=True)
+        return None
+
+
+def _take_local(key: str, rate: float, capacity: float, now: float) -> float:
+    # fração deste worker no limite total
+    workers = max(1, getattr(settings, "API_THROTTLE_WORKERS", 1))
+    rate, capacity = rate / workers, max(1.0, capacity / workers)
+    with _lock:
+        state = _local_buckets.get(key)
+        tokens, last = state[:2] if state else (capacity, now)
+        tokens = min(capacity, tokens + max(0.0, now - last) * rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / rate
+        if len(_local_buckets) >= MAX_LOCAL_BUCKETS:
+            _prune(now)
+        # o terceiro item é quando o balde volta a encher sem requisições
+        _local_buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+    return wait
+
+
+def take_token(key: str, rate: float, capacity: float, now: float | None = None) -> float:
+    """Consome uma ficha do balde `key`. Retorna 0 se permitido, senão os segundos de espera."""
+    now = time.time() if now is None else now
+    wait = _take_shared(key, rate, capacity, now)
+    return _take_local(key, rate, capacity, now) if wait is None else wait
+
+
+def record_hit(scope: str) -> None:
+    key = f"{HITS_PREFIX}:{scope}"
+    try:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+    except Exception:
+        with _lock:
+            _local_hits[scope] = _local_hits.get(scope, 0) + 1
+
+
+def throttle_hits() -> dict[str, int]:
+    scopes = list({**DEFAULT_BUCKETS, **getattr(settings, "API_THROTTLE_BUCKETS", {})})
+    try:
+        stored = cache.get_many([f"{HITS_PREFIX}:{scope}" for scope in scopes])
+    except Exception:
+        stored = {}
+    return {
+        scope: stored.get(f"{HITS_PREFIX}:{scope}", 0) + _local_hits.get(scope, 0)
+        for scope in scopes
+    }
+
+
+class TokenBucketThrottle(BaseThrottle, metaclass=abc.ABCMeta):
+    scope: str = ""
+
+    @abc.abstractmethod
+    def get_ident_key(self, request, view) -> str | None:
+        """Identificador do balde da requisição; None dispensa o limite."""
+
+    def allow_request(self, request, view) -> bool:
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return True
+        rate, capacity = bucket_config(self.scope)
+        self._wait = take_token(f"{BUCKET_PREFIX}:{self.scope}:{ident}", rate, capacity)
+        if self._wait:
+            record_hit(self.scope)
+            logger.warning("API throttled (%s:%s), retry in %.1fs", self.scope, ident, self._wait)
+            return False
+        return True
+
+    def wait(self):
+        return getattr(self, "_wait", None)
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    scope = "user"
+
+    def get_ident_key(self, request, view):
+        return request.user.pk if request.user and request.user.is_authenticated else None
+
+
+class OrganizationTokenBucketThrottle(TokenBucketThrottle):
+    """Balde compartilhado por todos os usuários da mesma ONG."""
+
+    scope = "org"
+
+    def get_ident_key(self, request, view):
+        if not (request.user and request.user.is_authenticated):
+            return None
+        return request.user.organization_id
+
+
+class DeliverTokenBucketThrottle(UserTokenBucketThrottle):
+    """Balde extra (por usuário) para a ação de entrega, que escreve e trava estoque."""
+
+    scope = "deliver"
@@ -1,13 +1,17 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from .views import BeneficiaryViewSet, DistributionViewSet
+from .views import AttendanceAnalyticsView, AuditLogView, BeneficiaryViewSet, DistributionViewSet, SyncView, ThrottleMetricsView
 
 router = DefaultRouter()
 router.register(r"beneficiaries", BeneficiaryViewSet, basename="beneficiary")
 router.register(r"distributions", DistributionViewSet, basename="distribution")
 
 urlpatterns = [
+    path("analytics/attendance/", AttendanceAnalyticsView.as_view(), name="attendance-analytics"),
+    path("sync/", SyncView.as_view(), name="sync"),
+    path("audit/", AuditLogView.as_view(), name="audit-log"),
+    path("metrics/throttles/", ThrottleMetricsView.as_view(), name="throttle-metrics"),
     path("", include(router.urls)),
 ]
 
@@ -1,33 +1,96 @@
 from datetime import date
 
+from django.db.models import Count, Max, Q
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import BasePermission, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from core.models import Beneficiary, Distribution, Product, deliver_basket
+from core.analytics import get_attendance_matrix
+from core.audit import log_action
+from core.changes import (
+    BENEFICIARY,
+    CHANGE_FEED_MAX_PAGE_SIZE,
+    CHANGE_FEED_PAGE_SIZE,
+    DISTRIBUTION,
+    changes_since,
+    decode_cursor,
+)
+from core.directory import get_organization
+from core.models import AuditLog, Beneficiary, Distribution, Product, deliver_basket
 from core.validators import normalize_identifier
-from .serializers import BeneficiarySerializer, DistributionSerializer
+from panel.audit import audit_filters, filter_audit_logs, keyset_page
+from .conditional import ConditionalGetMixin
+from .fieldsets import SparseFieldsViewMixin
+from .imports import csv_records, import_beneficiaries, ndjson_records
+from .serializers import AuditLogSerializer, BeneficiarySerializer, DistributionSerializer
+from .throttles import (
+    DeliverTokenBucketThrottle,
+    OrganizationTokenBucketThrottle,
+    UserTokenBucketThrottle,
+    throttle_hits,
+)
 
 
-class BeneficiaryViewSet(viewsets.ModelViewSet):
+# Limite de identificadores por chamada de POST distributions/check-by-identifier/
+IDENTIFIER_CHECK_MAX = 5000
+# Página da lista de beneficiários em GET analytics/attendance/
+ATTENDANCE_ANALYTICS_PAGE_SIZE = 100
+ATTENDANCE_ANALYTICS_MAX_PAGE_SIZE = 1000
+
+
+class BeneficiaryViewSet(ConditionalGetMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
     serializer_class = BeneficiarySerializer
     permission_classes = [IsAuthenticated]
+    # vincular/desvincular da ONG muda a lista sem mexer no beneficiário
+    extra_stamp_fields = ["organizations__created_at"]
 
     def get_queryset(self):
         user = self.request.user
-        return Beneficiary.objects.filter(organizations__organization=user.organization)
+        return Beneficiary.objects.filter(organizations__organization_id=user.organization_id)
+
+    @action(methods=["post"], detail=False, url_path="import")
+    def bulk_import(self, request):
+        """Cadastro em massa: corpo NDJSON (padrão) ou CSV (`Content-Type: text/csv`)."""
+        user = request.user
+        if not user.organization_id:
+            return Response({"detail": "Usuário sem organização vinculada."}, status=400)
+        # lê o corpo como stream, linha a linha, sem passar pelos parsers do DRF
+        lines = request.stream or []
+        if request.content_type.startswith("text/csv"):
+            records = csv_records(lines)
+        else:
+            records = ndjson_records(lines)
+        try:
+            summary = import_beneficiaries(records, organization_id=user.organization_id)
+        except UnicodeDecodeError:
+            return Response({"detail": "O arquivo deve estar em UTF-8."}, status=400)
+        log_action(
+            user,
+            request,
+            "beneficiary_import",
+            model_name="Beneficiary",
+            description=f"{summary['created']} novos, {summary['linked']} vinculados, {summary['error_count']} erros",
+            organization=get_organization(user.organization_id),
+        )
+        return Response(summary, status=status.HTTP_200_OK)
 
 
-class DistributionViewSet(viewsets.ReadOnlyModelViewSet):
+class DistributionViewSet(ConditionalGetMixin, SparseFieldsViewMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = DistributionSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
-        return Distribution.objects.filter(organization=user.organization)
+        # select_related do beneficiário só com ?expand=beneficiary (SparseFieldsViewMixin)
+        return Distribution.objects.filter(organization_id=user.organization_id)
 
-    @action(methods=["post"], detail=False)
+    @action(
+        methods=["post"],
+        detail=False,
+        throttle_classes=[UserTokenBucketThrottle, OrganizationTokenBucketThrottle, DeliverTokenBucketThrottle],
+    )
     def deliver(self, request):
         user = request.user
         beneficiary_id = request.data.get("beneficiary_id")
@@ -73,4 +136,196 @@ class DistributionViewSet(viewsets.ReadOnlyModelViewSet):
         exists = Distribution.objects.filter(beneficiary=b, period_month=month_start).exists()
         return Response({"exists": exists})
 
+    @check_by_identifier.mapping.post
+    def check_by_identifiers(self, request):
+        """Versão em lote: {"identifiers": [...], "period_month": "YYYY-MM-01"}.
+
+        Duas consultas para qualquer quantidade (até IDENTIFIER_CHECK_MAX):
+        beneficiários por `identifier__in` e entregas agrupadas por beneficiário.
+        """
+        identifiers = request.data.get("identifiers")
+        period_month = request.data.get("period_month")
+        if not isinstance(identifiers, list) or not period_month:
+            return Response({"detail": "identifiers (lista) e period_month são obrigatórios"}, status=400)
+        if len(identifiers) > IDENTIFIER_CHECK_MAX:
+            return Response({"detail": f"Máximo de {IDENTIFIER_CHECK_MAX} identificadores por chamada"}, status=400)
+        try:
+            month_start = date.fromisoformat(str(period_month)).replace(day=1)
+        except ValueError:
+            return Response({"detail": "period_month inválido (YYYY-MM-01)"}, status=400)
+
+        normalized = {str(raw): normalize_identifier(str(raw)) for raw in identifiers}
+        beneficiaries = dict(
+            Beneficiary.objects.filter(identifier__in={n for n in normalized.values() if n})
+            .values_list("identifier", "id")
+        )
+        deliveries = {
+            row["beneficiary_id"]: row
+            for row in Distribution.objects.filter(beneficiary_id__in=beneficiaries.values())
+            .values("beneficiary_id")
+            .annotate(last=Max("delivered_at"), this_month=Count("id", filter=Q(period_month=month_start)))
+            .order_by()
+        }
+        results = {}
+        for raw, identifier in normalized.items():
+            beneficiary_id = beneficiaries.get(identifier)
+            row = deliveries.get(beneficiary_id, {})
+            results[raw] = {
+                "exists": beneficiary_id is not None,
+                "delivered_this_month": bool(row.get("this_month")),
+                "last_delivered_at": row.get("last"),
+            }
+        return Response({"period_month": month_start, "results": results})
+
+
+def _next_offset(offset: int, limit: int, total: int) -> int | None:
+    return offset + limit if offset + limit < total else None
+
+
+class AttendanceAnalyticsView(APIView):
+    """Taxas de presença, desistências e coortes da organização do usuário.
+
+    A lista `beneficiaries` é paginada por `?offset=`/`?limit=` (máx.
+    `ATTENDANCE_ANALYTICS_MAX_PAGE_SIZE`) ou restrita a um só com `?beneficiary=<id>`.
+    `dropouts` e `cohorts` usam o mesmo `limit`, com `?dropouts_offset=` e
+    `?cohorts_offset=`; cada lista traz o total (`*_count`) e o próximo offset.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        if not user.organization_id:
+            return Response({"detail": "Usuário sem organização vinculada."}, status=400)
+        params = request.query_params
+        try:
+            min_absences = max(1, int(params.get("min_absences") or 3))
+        except ValueError:
+            return Response({"detail": "min_absences inválido"}, status=400)
+        try:
+            offset = max(0, int(params.get("offset") or 0))
+            dropouts_offset = max(0, int(params.get("dropouts_offset") or 0))
+            cohorts_offset = max(0, int(params.get("cohorts_offset") or 0))
+            limit = min(ATTENDANCE_ANALYTICS_MAX_PAGE_SIZE, max(1, int(params.get("limit") or ATTENDANCE_ANALYTICS_PAGE_SIZE)))
+        except ValueError:
+            return Response({"detail": "offset/limit inválidos"}, status=400)
+        matrix = get_attendance_matrix(user.organization)
+        total = len(matrix.beneficiary_ids)
+        if params.get("beneficiary"):
+            try:
+                indexes = [matrix.beneficiary_ids.index(int(params["beneficiary"]))]
+            except ValueError:
+                indexes = []
+            next_offset = None
+        else:
+            indexes = range(offset, min(offset + limit, total))
+            next_offset = _next_offset(offset, limit, total)
+        beneficiaries = matrix.beneficiary_stats(indexes)
+        for i, item in zip(indexes, beneficiaries):
+            item["monthly"] = matrix.monthly_rates(i)
+        dropouts = matrix.dropouts(min_absences)
+        cohorts = matrix.cohorts()
+        return Response({
+            "events": len(matrix.events),
+            "months": matrix.month_totals(),
+            "beneficiary_count": total,
+            "next_offset": next_offset,
+            "beneficiaries": beneficiaries,
+            "dropout_count": len(dropouts),
+            "dropouts_next_offset": _next_offset(dropouts_offset, limit, len(dropouts)),
+            "dropouts": dropouts[dropouts_offset:dropouts_offset + limit],
+            "cohort_count": len(cohorts),
+            "cohorts_next_offset": _next_offset(cohorts_offset, limit, len(cohorts)),
+            "cohorts": cohorts[cohorts_offset:cohorts_offset + limit],
+        })
+
+
+class SyncView(APIView):
+    """Sincronização incremental (clientes offline) de beneficiários e distribuições da ONG.
+
+    `?since=<cursor>` ("<txid>-<id>"; 0 ou ausente: desde o início) e `?limit=`. Devolve os
+    registros atuais do que mudou depois do cursor, os ids excluídos
+    (`deleted`), o novo `cursor` e `has_more` (chamar de novo até ser false).
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        org_id = request.user.organization_id
+        if not org_id:
+            return Response({"detail": "Usuário sem organização vinculada."}, status=400)
+        try:
+            since = request.query_params.get("since") or "0"
+            decode_cursor(since)
+            limit = min(CHANGE_FEED_MAX_PAGE_SIZE, max(1, int(request.query_params.get("limit") or CHANGE_FEED_PAGE_SIZE)))
+        except ValueError:
+            return Response({"detail": "since/limit inválidos"}, status=400)
+        feed = changes_since(org_id, since, limit=limit)
+        beneficiaries = list(
+            Beneficiary.objects.filter(pk__in=feed["changed"][BENEFICIARY], organizations__organization_id=org_id)
+        )
+        distributions = list(
+            Distribution.objects.filter(pk__in=feed["changed"][DISTRIBUTION], organization_id=org_id)
+        )
+        # O que mudou mas já não é visível para a ONG (desvinculado depois) também é exclusão
+        deleted_beneficiaries = set(feed["deleted"][BENEFICIARY]) | (
+            set(feed["changed"][BENEFICIARY]) - {b.pk for b in beneficiaries}
+        )
+        deleted_distributions = set(feed["deleted"][DISTRIBUTION]) | (
+            set(feed["changed"][DISTRIBUTION]) - {d.pk for d in distributions}
+        )
+        return Response({
+            "cursor": feed["cursor"],
+            "has_more": feed["has_more"],
+            "beneficiaries": BeneficiarySerializer(beneficiaries, many=True).data,
+            "distributions": DistributionSerializer(distributions, many=True).data,
+            "deleted": {
+                "beneficiaries": sorted(deleted_beneficiaries),
+                "distributions": sorted(deleted_distributions),
+            },
+        })
+
+
+class IsSuperuser(BasePermission):
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_superuser)
+
+
+class AuditLogView(APIView):
+    """Consulta da auditoria (admin global) com os mesmos filtros do audit_page.
+
+    Filtros: organization, start, end, action, model_name, object_id, user, q.
+    Paginação por cursor: `next`/`previous` vão em `before`/`after`.
+    """
+
+    permission_classes = [IsAuthenticated, IsSuperuser]
+
+    def get(self, request):
+        try:
+            size = min(500, max(1, int(request.query_params.get("page_size") or 100)))
+        except ValueError:
+            return Response({"detail": "page_size inválido"}, status=400)
+        qs = filter_audit_logs(
+            AuditLog.objects.select_related("user", "organization"),
+            **audit_filters(request.query_params),
+        )
+        page = keyset_page(
+            qs,
+            before=request.query_params.get("before"),
+            after=request.query_params.get("after"),
+            size=size,
+        )
+        return Response({
+            "next": page["older"],
+            "previous": page["newer"],
+            "results": AuditLogSerializer(page["rows"], many=True).data,
+        })
+
+
+class ThrottleMetricsView(APIView):
+    """Requisições recusadas pelos limites da API, por escopo (desde a última limpeza do cache)."""
+
+    permission_classes = [IsAuthenticated, IsSuperuser]
 
+    def get(self, request):
+        return Response({"hits": throttle_hits()})
@@ -0,0 +1,266 @@
+"""Análises de presença e de distribuições.
+
+A matriz (evento × beneficiário) é carregada com uma única consulta e mantida
+como bitmaps: para cada beneficiário, um inteiro com um bit por evento em que
+houve registro de presença e outro com os bits em que esteve presente. Taxas,
+sequências de faltas e coortes saem de operações de bits sobre esses inteiros,
+sem laços sobre o ORM. O resultado fica em cache por organização e é
+invalidado pelos sinais de `Attendance`/`Event` (ver core.signals).
+
+O pivô de distribuições (ONG × mês × produto) é calculado com uma única
+consulta agrupada apenas para os meses que não estão em cache. Meses fechados
+ficam em cache sem prazo de expiração; o mês corrente é sempre recalculado.
+Entregas lançadas ou removidas num mês já fechado invalidam só aquele mês,
+depois do commit.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Attendance, Distribution, Organization, Product
+
+
+CACHE_PREFIX = "attendance_matrix"
+
+
+def _cache_key(org_id) -> str:
+    return f"{CACHE_PREFIX}:{org_id or 'all'}"
+
+
+def _cache_ttl() -> int:
+    return getattr(settings, "ATTENDANCE_ANALYTICS_CACHE_TTL", 600)
+
+
+def _ratio(num: int, den: int) -> float | None:
+    return round(num / den, 4) if den else None
+
+
+class AttendanceMatrix:
+    """Matriz compacta de presenças de uma organização."""
+
+    def __init__(self, events, beneficiary_ids, recorded, present):
+        # events: lista de (event_id, date) em ordem cronológica; o índice é o bit
+        self.events = events
+        self.beneficiary_ids = beneficiary_ids
+        self.recorded = recorded
+        self.present = present
+        self.months = sorted({d.strftime("%Y-%m") for _, d in events})
+        month_index = {m: i for i, m in enumerate(self.months)}
+        self.month_masks = [0] * len(self.months)
+        self.event_month = []
+        for bit, (_, d) in enumerate(events):
+            idx = month_index[d.strftime("%Y-%m")]
+            self.month_masks[idx] |= 1 << bit
+            self.event_month.append(idx)
+
+    @classmethod
+    def load(cls, organization=None) -> "AttendanceMatrix":
+        qs = Attendance.objects.all()
+        if organization is not None:
+            qs = qs.filter(event__organization=organization)
+        rows = qs.values_list("event_id", "event__date", "beneficiary_id", "present")
+
+        event_dates = {}
+        triples = []
+        for event_id, event_date, beneficiary_id, present in rows.iterator(chunk_size=5000):
+            event_dates[event_id] = event_date
+            triples.append((event_id, beneficiary_id, present))
+
+        events = sorted(event_dates.items(), key=lambda item: (item[1], item[0]))
+        event_bit = {event_id: bit for bit, (event_id, _) in enumerate(events)}
+
+        position = {}
+        recorded = []
+        present_masks = []
+        for event_id, beneficiary_id, present in triples:
+            idx = position.get(beneficiary_id)
+            if idx is None:
+                idx = position[beneficiary_id] = len(recorded)
+                recorded.append(0)
+                present_masks.append(0)
+            bit = 1 << event_bit[event_id]
+            recorded[idx] |= bit
+            if present:
+                present_masks[idx] |= bit
+        return cls(events, list(position), recorded, present_masks)
+
+    # --- Métricas -----------------------------------------------------------
+    def rate(self, idx: int) -> float | None:
+        return _ratio(self.present[idx].bit_count(), self.recorded[idx].bit_count())
+
+    def monthly_rates(self, idx: int) -> dict:
+        recorded = self.recorded[idx]
+        present = self.present[idx]
+        rates = {}
+        for month, mask in zip(self.months, self.month_masks):
+            den = (recorded & mask).bit_count()
+            if den:
+                rates[month] = _ratio((present & mask).bit_count(), den)
+        return rates
+
+    def absence_streak(self, idx: int) -> int:
+        """Faltas consecutivas desde a última presença (ou desde o início)."""
+        present = self.present[idx]
+        return (self.recorded[idx] >> present.bit_length()).bit_count()
+
+    def beneficiary_stats(self, indexes=None) -> list[dict]:
+        """Indicadores por beneficiário; `indexes` restringe às posições dadas (paginação)."""
+        if indexes is None:
+            indexes = range(len(self.beneficiary_ids))
+        return [
+            {
+                "beneficiary_id": self.beneficiary_ids[i],
+                "events": self.recorded[i].bit_count(),
+                "present": self.present[i].bit_count(),
+                "rate": self.rate(i),
+                "absence_streak": self.absence_streak(i),
+            }
+            for i in indexes
+        ]
+
+    def dropouts(self, min_absences: int = 3) -> list[dict]:
+        """Beneficiários que já compareceram e acumulam `min_absences` faltas seguidas."""
+        result = []
+        for i, bid in enumerate(self.beneficiary_ids):
+            if not self.present[i]:
+                continue
+            streak = self.absence_streak(i)
+            if streak >= min_absences:
+                last_event_id, last_date = self.events[self.present[i].bit_length() - 1]
+                result.append({
+                    "beneficiary_id": bid,
+                    "absence_streak": streak,
+                    "last_present_event_id": last_event_id,
+                    "last_present_date": last_date,
+                })
+        result.sort(key=lambda item: (-item["absence_streak"], item["beneficiary_id"]))
+        return result
+
+    def cohorts(self) -> list[dict]:
+        """Retenção por coorte (mês da primeira presença × meses seguintes)."""
+        groups = {}
+        for present in self.present:
+            if not present:
+                continue
+            first_bit = (present & -present).bit_length() - 1
+            groups.setdefault(self.event_month[first_bit], []).append(present)
+        result = []
+        for start in sorted(groups):
+            members = groups[start]
+            retained = [
+                sum(1 for present in members if present & mask)
+                for mask in self.month_masks[start:]
+            ]
+            result.append({
+                "month": self.months[start],
+                "size": len(members),
+                "retained": retained,
+            })
+        return result
+
+    def month_totals(self) -> list[dict]:
+        totals = []
+        for month, mask in zip(self.months, self.month_masks):
+            recorded = sum((r & mask).bit_count() for r in self.recorded)
+            present = sum((p & mask).bit_count() for p in self.present)
+            totals.append({"month": month, "recorded": recorded, "present": present, "rate": _ratio(present, recorded)})
+        return totals
+
+
+def get_attendance_matrix(organization=None) -> AttendanceMatrix:
+    """Retorna a matriz da organização, usando o cache enquanto não houver mudanças."""
+    key = _cache_key(getattr(organization, "id", None))
+    matrix = cache.get(key)
+    if matrix is None:
+        matrix = AttendanceMatrix.load(organization)
+        cache.set(key, matrix, _cache_ttl())
+    return matrix
+
+
+def invalidate_attendance_matrix(org_id) -> None:
+    cache.delete_many([_cache_key(org_id), _cache_key(None)])
+
+
+# --- Pivô de distribuições ------------------------------------------------------------
+PIVOT_PREFIX = "distribution_pivot"
+
+
+def _pivot_key(month: date) -> str:
+    return f"{PIVOT_PREFIX}:{month:%Y-%m}"
+
+
+def month_range(start: date, end: date) -> list[date]:
+    """Primeiros dias dos meses entre `start` e `end` (inclusive)."""
+    months = []
+    current = start.replace(day=1)
+    while current <= end:
+        months.append(current)
+        current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return months
+
+
+def _pivot_cells(months: list[date]) -> dict:
+    """{mês: [(org_id, product_id, total), ...]} para a rede toda, com cache por mês fechado."""
+    current_month = timezone.localdate().replace(day=1)
+    cached = cache.get_many([_pivot_key(m) for m in months if m < current_month])
+    cells = {m: cached[_pivot_key(m)] for m in months if _pivot_key(m) in cached}
+    missing = [m for m in months if m not in cells]
+    if missing:
+        rows = (
+            Distribution.objects.filter(period_month__in=missing)
+            .values("period_month", "organization", "product")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+        fresh = {m: [] for m in missing}
+        for row in rows:
+            fresh[row["period_month"]].append((row["organization"], row["product"], row["total"]))
+        closed = {_pivot_key(m): data for m, data in fresh.items() if m < current_month}
+        if closed:
+            cache.set_many(closed, timeout=None)
+        cells.update(fresh)
+    return cells
+
+
+def distribution_pivot(months: list[date], organization=None) -> dict:
+    """Tabela ONG × produto × mês com totais, pronta para HTML ou JSON."""
+    cells = _pivot_cells(months)
+    org_id = getattr(organization, "id", None)
+    table = {}
+    for index, month in enumerate(months):
+        for row_org, product_id, total in cells[month]:
+            if org_id is not None and row_org != org_id:
+                continue
+            table.setdefault((row_org, product_id), [0] * len(months))[index] = total
+
+    org_names = dict(Organization.objects.filter(id__in={o for o, _ in table}).values_list("id", "name"))
+    product_names = dict(Product.objects.filter(id__in={p for _, p in table}).values_list("id", "name"))
+    rows = [
+        {
+            "organization_id": row_org,
+            "organization": org_names.get(row_org, ""),
+            "product_id": product_id,
+            "product": product_names.get(product_id, ""),
+            "counts": counts,
+            "total": sum(counts),
+        }
+        for (row_org, product_id), counts in table.items()
+    ]
+    rows.sort(key=lambda r: (r["organization"], r["product"]))
+    month_totals = [sum(r["counts"][i] for r in rows) for i in range(len(months))]
+    return {
+        "months": [m.strftime("%Y-%m") for m in months],
+        "rows": rows,
+        "month_totals": month_totals,
+        "total": sum(month_totals),
+    }
+
+
+def invalidate_distribution_pivot(period_month: date) -> None:
+    cache.delete(_pivot_key(period_month))
@@ -1,15 +1,52 @@
+"""Registro de auditoria.
+
+Por padrão as entradas não são gravadas dentro da request: `log_action` monta o
+`AuditLog` e o coloca num buffer do processo (só depois do commit, se houver
+transação aberta, para não auditar o que foi desfeito). O buffer é gravado com
+um único `bulk_create` ao fim da request (sinal `request_finished`, depois que
+a resposta já foi enviada), por um timer em segundo plano após
+`AUDIT_LOG_FLUSH_SECONDS`, ao atingir `AUDIT_LOG_BUFFER_SIZE` entradas e ao
+encerrar o worker.
+
+Com `AUDIT_LOG_ASYNC = False` (ex.: testes) cada entrada é gravada na hora.
+"""
+
 from __future__ import annotations
 
+import atexit
+import threading
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import connection, transaction
+from django.dispatch import receiver
 from django.utils import timezone
 from .models import AuditLog
 from . import get_client_ip
 
 
+_lock = threading.Lock()
+_buffer: list[AuditLog] = []
+_timer: threading.Timer | None = None
+
+
+def _async_enabled() -> bool:
+	return getattr(settings, "AUDIT_LOG_ASYNC", True)
+
+
+def _flush_delay() -> float:
+	return getattr(settings, "AUDIT_LOG_FLUSH_SECONDS", 2)
+
+
+def _buffer_size() -> int:
+	return getattr(settings, "AUDIT_LOG_BUFFER_SIZE", 500)
+
+
 def log_action(user, request, action: str, *, model_name: str = "", object_id: str = "", description: str = "", organization=None) -> None:
 	try:
-		AuditLog.objects.create(
-			user=user,
-			organization=organization,
+		entry = AuditLog(
+			user_id=getattr(user, "pk", None),
+			organization_id=getattr(organization, "pk", None),
 			action=action,
 			model_name=model_name,
 			object_id=str(object_id or ""),
@@ -18,6 +55,71 @@ def log_action(user, request, action: str, *, model_name: str = "", object_id: s
 			user_agent=request.META.get("HTTP_USER_AGENT", ""),
 			created_at=timezone.now(),
 		)
+		if not _async_enabled():
+			entry.save()
+			return
+		transaction.on_commit(lambda: _enqueue(entry))
 	except Exception:
 		# auditoria não deve quebrar fluxo
 		return
+
+
+def _enqueue(entry: AuditLog) -> None:
+	global _timer
+	with _lock:
+		_buffer.append(entry)
+		full = len(_buffer) >= _buffer_size()
+		if not full and _timer is None:
+			_timer = threading.Timer(_flush_delay(), _flush_from_timer)
+			_timer.daemon = True
+			_timer.start()
+	if full:
+		flush()
+
+
+def flush() -> int:
+	"""Grava as entradas pendentes num único INSERT em lote."""
+	global _timer
+	with _lock:
+		batch = list(_buffer)
+		_buffer.clear()
+		if _timer is not None:
+			_timer.cancel()
+			_timer = None
+	if not batch:
+		return 0
+	try:
+		AuditLog.objects.bulk_create(batch)
+	except Exception:
+		# ex.: usuário/ONG apagados entre o registro e a gravação; grava o que der
+		for entry in batch:
+			try:
+				entry.save()
+			except Exception:
+				pass
+	return len(batch)
+
+
+def _flush_from_timer() -> None:
+	try:
+		flush()
+	except Exception:
+		pass
+	finally:
+		connection.close()
+
+
+@receiver(request_finished, dispatch_uid="core.audit.flush")
+def _flush_on_request_finished(sender, **kwargs) -> None:
+	try:
+		flush()
+	except Exception:
+		pass
+
+
+@atexit.register
+def _flush_on_exit() -> None:
+	try:
+		flush()
+	except Exception:
+		pass
@@ -0,0 +1,37 @@
+"""Cache em arquivo sem varredura do diretório a cada escrita.
+
+O `FileBasedCache` do Django chama `_cull()` em todo `set()`, e o `_cull()`
+lista o diretório inteiro (glob) para contar as entradas. Com sessões,
+fichas de throttle, tokens e versões de linhas gravando a cada request, essa
+listagem vira o custo dominante da escrita.
+
+Este backend faz a mesma limpeza, mas no máximo uma vez a cada
+`CULL_INTERVAL` segundos por processo (OPTIONS, padrão 60). Entre uma limpeza
+e outra o diretório pode passar um pouco de `MAX_ENTRIES`; entradas vencidas
+continuam sendo descartadas na leitura.
+
+Uso: CACHES["default"]["BACKEND"] = "core.cache.FileBasedCache"
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from django.core.cache.backends import filebased
+
+
+class FileBasedCache(filebased.FileBasedCache):
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        self._cull_interval = float(params.get("OPTIONS", {}).get("CULL_INTERVAL", 60))
+        self._cull_lock = threading.Lock()
+        self._next_cull = 0.0
+
+    def _cull(self):
+        now = time.monotonic()
+        with self._cull_lock:
+            if now < self._next_cull:
+                return
+            self._next_cull = now + self._cull_interval
+        super()._cull()
@@ -0,0 +1,110 @@
+"""Sequência de alterações (change feed) para clientes offline.
+
+Inclusões, alterações e exclusões de beneficiários (inclusive o vínculo com a
+ONG) e de distribuições gravam uma linha em `ChangeLog`, na mesma transação da
+escrita (sinais em core.signals; a importação em massa grava em lote). O id da
+linha é o cursor: o cliente pede `since=<último cursor>` e recebe só o que
+mudou depois, então o custo acompanha o volume de alterações, não o tamanho do
+cadastro.
+
+A ordem do feed é a de confirmação, não a de inserção: ids são reservados na
+inserção e as transações podem terminar fora de ordem, então um cursor por id
+poderia passar por cima de uma alteração ainda não confirmada. No PostgreSQL
+cada linha guarda o id da transação que a gravou (`txid_current()`), o feed é
+ordenado por (txid, id) e só entrega transações abaixo do `xmin` do snapshot
+atual, isto é, já encerradas; o que ainda está aberto tem txid maior e entra
+depois do cursor. O cursor é "<txid>-<id>" ("0" para o início). No SQLite um
+escritor por vez segura o banco até o commit, então a ordem dos ids já é a de
+confirmação e o txid fica 0.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import ChangeLog
+
+
+BENEFICIARY = "beneficiary"
+DISTRIBUTION = "distribution"
+
+CHANGE_FEED_PAGE_SIZE = 500
+CHANGE_FEED_MAX_PAGE_SIZE = 5000
+
+
+def _current_txid() -> int:
+    if connection.vendor != "postgresql":
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT txid_current()")
+        return cursor.fetchone()[0]
+
+
+def _visible_txid_horizon() -> int | None:
+    """Menor txid ainda em andamento (PostgreSQL); transações abaixo dele já terminaram."""
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT txid_snapshot_xmin(txid_current_snapshot())")
+        return cursor.fetchone()[0]
+
+
+def encode_cursor(txid: int, seq: int) -> str:
+    return f"{txid}-{seq}"
+
+
+def decode_cursor(value) -> tuple[int, int]:
+    """"<txid>-<id>" -> (txid, id); vazio ou "0" é o início. ValueError se inválido."""
+    if value in (None, "", "0", 0):
+        return 0, 0
+    txid, seq = (int(part) for part in str(value).split("-", 1))
+    if txid < 0 or seq < 0:
+        raise ValueError(value)
+    return txid, seq
+
+
+def record_changes(organization_ids: Iterable, model_name: str, object_ids: Iterable, *, deleted: bool = False) -> None:
+    object_ids = list(object_ids)
+    # o txid precisa ser o da transação que insere as linhas (em autocommit, seriam duas)
+    with transaction.atomic():
+        txid = _current_txid()
+        ChangeLog.objects.bulk_create([
+            ChangeLog(organization_id=org_id, model_name=model_name, object_id=pk, deleted=deleted, txid=txid)
+            for org_id in organization_ids
+            if org_id
+            for pk in object_ids
+        ])
+
+
+def changes_since(organization_id, since="0", *, limit: int = CHANGE_FEED_PAGE_SIZE) -> dict:
+    """Alterações da ONG depois do cursor `since`, compactadas por objeto.
+
+    Retorna `{"cursor", "has_more", "changed": {modelo: [ids]}, "deleted": {modelo: [ids]}}`;
+    se o mesmo objeto mudou várias vezes na página, vale a última.
+    """
+    txid, seq = decode_cursor(since)
+    qs = ChangeLog.objects.filter(Q(txid__gt=txid) | Q(txid=txid, id__gt=seq), organization_id=organization_id)
+    horizon = _visible_txid_horizon()
+    if horizon is not None:
+        qs = qs.filter(txid__lt=horizon)
+    rows = list(
+        qs.order_by("txid", "id").values_list("txid", "id", "model_name", "object_id", "deleted")[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    latest = {}
+    for _txid, _seq, model_name, object_id, deleted in rows:
+        latest[(model_name, object_id)] = deleted
+    changed = {BENEFICIARY: [], DISTRIBUTION: []}
+    removed = {BENEFICIARY: [], DISTRIBUTION: []}
+    for (model_name, object_id), deleted in latest.items():
+        (removed if deleted else changed).setdefault(model_name, []).append(object_id)
+    return {
+        "cursor": encode_cursor(*(rows[-1][:2] if rows else (txid, seq))),
+        "has_more": has_more,
+        "changed": changed,
+        "deleted": removed,
+    }
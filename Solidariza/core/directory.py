@@ -0,0 +1,109 @@
+"""Diretório de organizações em cache.
+
+Buscas de organização por id (ONG ativa da sessão, ONG do usuário) passam pelo
+cache padrão com TTL curto (`ORGANIZATION_CACHE_TTL`). Alterações e exclusões
+invalidam a entrada pelos sinais de `Organization` (ver core.signals); o TTL só
+limita a defasagem caso alguma escrita passe por fora do ORM.
+
+Listas de organizações (seletor do base.html, login, formulários de
+colaborador, filtros) vêm de `list_organizations`: uma cópia (id, nome, ativa)
+em memória no processo, recarregada quando o número de versão guardado no
+cache compartilhado muda. Os mesmos sinais trocam a versão, então os outros
+workers recarregam na próxima leitura.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Organization
+
+
+CACHE_PREFIX = "organization"
+VERSION_KEY = f"{CACHE_PREFIX}:directory_version"
+# Marca no cache ids que não existem, para não consultar o banco de novo
+_MISSING = "missing"
+
+
+def _cache_key(org_id) -> str:
+    return f"{CACHE_PREFIX}:{org_id}"
+
+
+def _cache_ttl() -> int:
+    return getattr(settings, "ORGANIZATION_CACHE_TTL", 60)
+
+
+def get_organization(org_id) -> Organization | None:
+    """Organização pelo id, ou None se não existir."""
+    try:
+        org_id = int(org_id)
+    except (TypeError, ValueError):
+        return None
+    key = _cache_key(org_id)
+    org = cache.get(key)
+    if org is None:
+        org = Organization.objects.filter(id=org_id).first() or _MISSING
+        cache.set(key, org, _cache_ttl())
+    return None if org == _MISSING else org
+
+
+def invalidate_organization(org_id) -> None:
+    cache.delete(_cache_key(org_id))
+
+
+class OrganizationEntry(NamedTuple):
+    id: int
+    name: str
+    is_active: bool
+
+
+_directory_lock = threading.Lock()
+# (versão, entradas ordenadas por nome) deste processo
+_directory: tuple[object, tuple[OrganizationEntry, ...]] | None = None
+
+
+def _directory_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # cache limpo ou expirado: cria uma versão nova (e todos recarregam)
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def list_organizations(*, active_only: bool = False) -> list[OrganizationEntry]:
+    """Organizações ordenadas por nome (id, name, is_active), sem consultar o banco a cada chamada."""
+    global _directory
+    version = _directory_version()
+    directory = _directory
+    if directory is None or directory[0] != version:
+        with _directory_lock:
+            entries = tuple(
+                OrganizationEntry(*row)
+                for row in Organization.objects.order_by("name", "id").values_list("id", "name", "is_active")
+            )
+            directory = _directory = (version, entries)
+    entries = directory[1]
+    return [entry for entry in entries if entry.is_active] if active_only else list(entries)
+
+
+def find_organization(org_id, *, active_only: bool = False) -> OrganizationEntry | None:
+    try:
+        org_id = int(org_id)
+    except (TypeError, ValueError):
+        return None
+    for entry in list_organizations(active_only=active_only):
+        if entry.id == org_id:
+            return entry
+    return None
+
+
+def invalidate_directory() -> None:
+    global _directory
+    _directory = None
+    cache.set(VERSION_KEY, time.time_ns(), None)
@@ -0,0 +1,143 @@
+"""Heartbeat de `UserSession` com escrita limitada e em lote.
+
+Cada processo guarda o instante da última escrita por sessão e só registra um
+novo heartbeat depois de `USER_SESSION_HEARTBEAT_SECONDS`. Os heartbeats ficam
+num buffer e são gravados com um único upsert (`bulk_create` com
+`update_conflicts`) quando o buffer enche, depois de
+`USER_SESSION_FLUSH_SECONDS` (timer em segundo plano) ou ao encerrar o worker.
+
+O atraso máximo de `last_seen` é intervalo + flush (~70 s no padrão), bem
+abaixo da menor janela de "online" do sessions_page (5 minutos).
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from . import get_client_ip
+from .models import Organization, UserSession
+
+
+_lock = threading.Lock()
+_last_write: dict[str, float] = {}
+_pending: dict[str, dict] = {}
+_timer: threading.Timer | None = None
+
+
+def _interval() -> int:
+    return getattr(settings, "USER_SESSION_HEARTBEAT_SECONDS", 60)
+
+
+def _flush_delay() -> int:
+    return getattr(settings, "USER_SESSION_FLUSH_SECONDS", 10)
+
+
+def _batch_size() -> int:
+    return getattr(settings, "USER_SESSION_FLUSH_BATCH", 100)
+
+
+def record(request) -> None:
+    """Registra a atividade da sessão se o último heartbeat já passou do intervalo."""
+    key = request.session.session_key
+    if not key:
+        return
+    now = time.monotonic()
+    last = _last_write.get(key)
+    if last is not None and now - last < _interval():
+        return
+
+    global _timer
+    with _lock:
+        _last_write[key] = now
+        _pending[key] = {
+            "user_id": request.user.pk,
+            "organization_id": request.session.get("active_organization_id"),
+            "ip_address": get_client_ip(request),
+            "user_agent": request.META.get("HTTP_USER_AGENT", ""),
+            "last_seen": timezone.now(),
+        }
+        if len(_last_write) > 10000:
+            _prune(now)
+        full = len(_pending) >= _batch_size()
+        if not full and _timer is None:
+            _timer = threading.Timer(_flush_delay(), _flush_from_timer)
+            _timer.daemon = True
+            _timer.start()
+    if full:
+        flush()
+
+
+def forget(session_key: str) -> None:
+    """Descarta o estado local de uma sessão encerrada."""
+    with _lock:
+        _last_write.pop(session_key, None)
+        _pending.pop(session_key, None)
+
+
+def _prune(now: float) -> None:
+    limit = now - _interval()
+    for key in [k for k, t in _last_write.items() if t < limit]:
+        del _last_write[key]
+
+
+def flush() -> int:
+    """Grava os heartbeats pendentes num único upsert.
+
+    `is_active` só vale na inserção: uma sessão encerrada (logout, expiração)
+    não volta a ficar ativa por um heartbeat que ainda estava pendente.
+    """
+    global _timer
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+    if not batch:
+        return 0
+
+    org_ids = {data["organization_id"] for data in batch.values() if data["organization_id"]}
+    valid_orgs = set(Organization.objects.filter(id__in=org_ids).values_list("id", flat=True)) if org_ids else set()
+    sessions = [
+        UserSession(
+            session_key=key,
+            user_id=data["user_id"],
+            organization_id=data["organization_id"] if data["organization_id"] in valid_orgs else None,
+            ip_address=data["ip_address"],
+            user_agent=data["user_agent"],
+            last_seen=data["last_seen"],
+            is_active=True,
+        )
+        for key, data in batch.items()
+    ]
+    UserSession.objects.bulk_create(
+        sessions,
+        update_conflicts=True,
+        unique_fields=["session_key"],
+        update_fields=["user", "organization", "ip_address", "user_agent", "last_seen"],
+    )
+    return len(sessions)
+
+
+def _flush_from_timer() -> None:
+    try:
+        flush()
+    except Exception:
+        # heartbeat não deve derrubar o worker
+        pass
+    finally:
+        connection.close()
+
+
+@atexit.register
+def _flush_on_exit() -> None:
+    try:
+        flush()
+    except Exception:
+        pass
@@ -1,9 +1,9 @@
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.urls import reverse
-from .models import Organization, UserSession
-from . import get_client_ip
-from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from . import heartbeat
+from .directory import get_organization
 
 
 class OrganizationAccessMiddleware:
@@ -15,6 +15,9 @@ class OrganizationAccessMiddleware:
         self.get_response = get_response
     
     def __call__(self, request):
+        # ONG ativa resolvida no máximo uma vez por request (ver get_active_organization)
+        request.active_organization = SimpleLazyObject(lambda: get_active_organization(request))
+
         # URLs que não precisam de verificação
         exempt_urls = [
             '/accounts/login/',
@@ -38,8 +41,8 @@ class OrganizationAccessMiddleware:
         # Admin global tem acesso irrestrito
         if request.user.is_superuser:
             # Para admin global, definir organização ativa se não existir
-            if 'active_organization_id' not in request.session and request.user.organization:
-                request.session['active_organization_id'] = request.user.organization.id
+            if 'active_organization_id' not in request.session and request.user.organization_id:
+                request.session['active_organization_id'] = request.user.organization_id
             response = self.get_response(request)
             return response
         
@@ -48,45 +51,27 @@ class OrganizationAccessMiddleware:
         
         if not active_org_id:
             # Se não há organização ativa, usar a organização do usuário
-            if request.user.organization:
-                request.session['active_organization_id'] = request.user.organization.id
+            if request.user.organization_id:
+                request.session['active_organization_id'] = request.user.organization_id
             else:
                 messages.error(request, 'Usuário não está vinculado a nenhuma organização.')
                 return redirect('login')
         else:
             # Verificar se o usuário tem acesso à organização ativa
-            try:
-                active_org = Organization.objects.get(id=active_org_id)
-                if request.user.organization != active_org:
-                    messages.error(request, 'Acesso negado a esta organização.')
-                    return redirect('login')
-            except Organization.DoesNotExist:
+            active_org = get_organization(active_org_id)
+            if active_org is None:
                 messages.error(request, 'Organização não encontrada.')
                 return redirect('login')
+            if request.user.organization_id != active_org.id:
+                messages.error(request, 'Acesso negado a esta organização.')
+                return redirect('login')
+            request._active_organization = (active_org_id, active_org)
         
         response = self.get_response(request)
-        # Atualiza last_seen das sessões
+        # Atualiza last_seen das sessões (com limite de escrita, ver core.heartbeat)
         try:
             if request.user.is_authenticated and request.session.session_key:
-                # ONG ativa da sessão
-                org_id = request.session.get('active_organization_id')
-                org = None
-                if org_id:
-                    try:
-                        org = Organization.objects.get(id=org_id)
-                    except Organization.DoesNotExist:
-                        org = None
-                UserSession.objects.update_or_create(
-                    session_key=request.session.session_key,
-                    defaults={
-                        'user': request.user,
-                        'organization': org,
-                        'ip_address': get_client_ip(request),
-                        'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                        'last_seen': timezone.now(),
-                        'is_active': True,
-                    },
-                )
+                heartbeat.record(request)
         except Exception:
             # não bloqueia a request caso a auditoria falhe
             pass
@@ -96,16 +81,21 @@ class OrganizationAccessMiddleware:
 def get_active_organization(request):
     """
     Função helper para obter a organização ativa do usuário.
+
+    O resultado fica memorizado no request enquanto a ONG ativa da sessão não
+    mudar, e as buscas por id passam pelo diretório em cache (core.directory).
     """
     if not request.user.is_authenticated:
         return None
-    
+
     active_org_id = request.session.get('active_organization_id')
-    if active_org_id:
-        try:
-            return Organization.objects.get(id=active_org_id)
-        except Organization.DoesNotExist:
-            pass
-    
-    # Fallback para a organização do usuário
-    return request.user.organization
+    memo = getattr(request, '_active_organization', None)
+    if memo is not None and memo[0] == active_org_id:
+        return memo[1]
+
+    org = get_organization(active_org_id) if active_org_id else None
+    if org is None:
+        # Fallback para a organização do usuário
+        org = get_organization(request.user.organization_id) if request.user.organization_id else None
+    request._active_organization = (active_org_id, org)
+    return org
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.7 on 2026-10-19 04:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_auditlog'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=64, verbose_name='Relatório')),
+                ('status', models.CharField(choices=[('PENDING', 'Na fila'), ('RUNNING', 'Em processamento'), ('DONE', 'Pronto'), ('FAILED', 'Falhou'), ('EXPIRED', 'Expirado')], default='PENDING', max_length=16)),
+                ('file_name', models.CharField(blank=True, max_length=255)),
+                ('rows', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('organization', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='core.organization')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Exportação de relatório',
+                'verbose_name_plural': 'Exportações de relatórios',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='core_report_status_f898a4_idx'), models.Index(fields=['user', 'created_at'], name='core_report_user_id_8316bc_idx')],
+            },
+        ),
+    ]
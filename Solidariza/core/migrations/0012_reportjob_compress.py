@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-19 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_reportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportjob',
+            name='compress',
+            field=models.BooleanField(default=False, verbose_name='Compactado (.gz)'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.7 on 2026-10-19 04:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_reportjob_compress'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['beneficiary', 'event'], name='core_attend_benefic_7ca0e9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='distribution',
+            index=models.Index(fields=['organization', 'delivered_at'], name='core_distri_organiz_ef8363_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='distribution',
+            index=models.Index(fields=['beneficiary', 'product', 'delivered_at'], name='core_distri_benefic_525f92_idx'),
+        ),
+    ]
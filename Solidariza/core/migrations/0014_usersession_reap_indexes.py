@@ -0,0 +1,23 @@
+# Generated by Django 5.0.7 on 2026-10-19 04:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_reports_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['is_active', 'last_seen'], name='core_userse_is_acti_1026b7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['last_seen'], name='core_userse_last_se_b97d8b_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.7 on 2026-10-19 04:42
+
+import logging
+
+from django.conf import settings
+from django.db import DatabaseError, migrations, models, transaction
+
+logger = logging.getLogger(__name__)
+
+TRIGRAM_INDEX = "core_auditlog_description_trgm"
+
+
+def create_trigram_index(apps, schema_editor):
+    """Índice GIN trigram para `description ILIKE '%...%'` (apenas PostgreSQL).
+
+    Se a extensão pg_trgm não puder ser criada a migração segue, mas registra
+    um aviso: a busca funciona, só que sem índice.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON core_auditlog USING gin (description gin_trgm_ops)"
+            )
+    except DatabaseError as exc:
+        logger.warning(
+            "Índice trigram de core_auditlog.description não criado (%s). "
+            "Crie a extensão pg_trgm como superusuário; a migração 0021 recria o índice.",
+            exc,
+        )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {TRIGRAM_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_auditlog_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['model_name', 'object_id', 'created_at'], name='core_auditl_model_n_f53390_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['action', 'created_at'], name='core_auditl_action_29a2bf_idx'),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.7 on 2026-10-19 04:57
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+BACKFILL_BATCH = 5000
+
+
+def backfill_changes(apps, schema_editor):
+    """Uma alteração por vínculo ONG/beneficiário e por distribuição já existentes,
+    para que `since=0` devolva o cadastro completo."""
+    ChangeLog = apps.get_model("core", "ChangeLog")
+    OrganizationBeneficiary = apps.get_model("core", "OrganizationBeneficiary")
+    Distribution = apps.get_model("core", "Distribution")
+    sources = [
+        ("beneficiary", OrganizationBeneficiary.objects.values_list("organization_id", "beneficiary_id")),
+        ("distribution", Distribution.objects.values_list("organization_id", "id")),
+    ]
+    for model_name, rows in sources:
+        batch = []
+        for org_id, object_id in rows.order_by("pk").iterator(chunk_size=BACKFILL_BATCH):
+            batch.append(ChangeLog(organization_id=org_id, model_name=model_name, object_id=object_id))
+            if len(batch) >= BACKFILL_BATCH:
+                ChangeLog.objects.bulk_create(batch)
+                batch = []
+        ChangeLog.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_api_tokens'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(max_length=32)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('organization', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.organization')),
+            ],
+            options={
+                'verbose_name': 'Alteração',
+                'verbose_name_plural': 'Alterações',
+                'indexes': [models.Index(fields=['organization', 'id'], name='core_change_organiz_137b54_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_changes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.0.7 on 2026-10-19 05:27
+
+import logging
+
+from django.conf import settings
+from django.db import DatabaseError, migrations, models, transaction
+
+logger = logging.getLogger(__name__)
+
+# icontains no PostgreSQL vira `UPPER(coluna::text) LIKE UPPER('%termo%')`; o índice
+# precisa ser sobre a mesma expressão para o planejador usá-lo. Nome e CPF do
+# beneficiário ficam de fora: no bench_reports o índice não mudou o tempo das buscas.
+TRIGRAM_INDEXES = {
+    "core_event_name_trgm": ("core_event", "name"),
+    "core_auditlog_description_trgm": ("core_auditlog", "description"),
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Índices GIN trigram para as buscas por trecho (apenas PostgreSQL).
+
+    Substitui o índice de 0017, que era sobre `description` sem UPPER e por isso
+    não servia ao `description__icontains`. Se a extensão pg_trgm não puder ser
+    criada a migração segue, mas registra um aviso: as buscas funcionam, só que
+    sem índice, até alguém criar a extensão e os índices à mão.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for name, (table, column) in TRIGRAM_INDEXES.items():
+                schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+                schema_editor.execute(
+                    f"CREATE INDEX {name} ON {table} USING gin ((UPPER({column}::text)) gin_trgm_ops)"
+                )
+    except DatabaseError as exc:
+        logger.warning(
+            "Índices trigram não criados (%s). Crie a extensão pg_trgm como superusuário e "
+            "os índices de TRIGRAM_INDEXES (core/migrations/0021_search_indexes.py); "
+            "sem eles as buscas por trecho varrem a tabela.",
+            exc,
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for name in TRIGRAM_INDEXES:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_change_log'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='distribution',
+            index=models.Index(fields=['delivered_at'], name='core_distri_deliver_515dec_idx'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.7 on 2026-10-19 05:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_reportjob_heartbeat'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='changelog',
+            name='core_change_organiz_137b54_idx',
+        ),
+        migrations.AddField(
+            model_name='changelog',
+            name='txid',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='changelog',
+            index=models.Index(fields=['organization', 'txid', 'id'], name='core_change_organiz_90f228_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+# Criados por versões anteriores da 0021; no bench_reports não aceleraram as buscas
+# por nome e CPF e só encareciam a escrita em core_beneficiary.
+INDEXES = ["core_beneficiary_name_trgm", "core_beneficiary_identifier_trgm"]
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for name in INDEXES:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_change_log_txid'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_indexes, migrations.RunPython.noop),
+    ]
@@ -31,10 +31,47 @@ class UserSession(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["user", "last_seen"]),
+            # "online" do sessions_page e encerramento por inatividade (reap_sessions)
+            models.Index(fields=["is_active", "last_seen"]),
+            # retenção (reap_sessions) e listagem completa ordenada
+            models.Index(fields=["last_seen"]),
         ]
         verbose_name = "Sessão de usuário"
         verbose_name_plural = "Sessões de usuários"
 
+
+class ApiToken(models.Model):
+    """Token de acesso à API, vinculado a um usuário e à sua ONG.
+
+    Só o hash (SHA-256) da chave é guardado; a chave aparece uma única vez,
+    na criação. Ver core.tokens.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="api_tokens")
+    organization = models.ForeignKey('Organization', on_delete=models.CASCADE, null=True, blank=True)
+    name = models.CharField("Nome", max_length=100)
+    # Início da chave, para identificá-la na listagem
+    prefix = models.CharField(max_length=16)
+    key_hash = models.CharField(max_length=64, unique=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField("Expira em", null=True, blank=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+    last_used_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.name} ({self.prefix}…)"
+
+    @property
+    def is_usable(self) -> bool:
+        return self.revoked_at is None and (self.expires_at is None or self.expires_at > timezone.now())
+
+    class Meta:
+        verbose_name = "Token da API"
+        verbose_name_plural = "Tokens da API"
+
+
 class Organization(models.Model):
     name = models.CharField("Nome da ONG", max_length=255)
     is_active = models.BooleanField("Ativa", default=True)
@@ -147,6 +184,8 @@ class Beneficiary(models.Model):
     state = models.CharField("UF", max_length=2, blank=True)
     active = models.BooleanField("Ativo", default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Validadores de cache da API (ETag)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:  # pragma: no cover
         return self.name
@@ -185,6 +224,10 @@ class Attendance(models.Model):
 
     class Meta:
         unique_together = ("event", "beneficiary")
+        indexes = [
+            # Semi-joins "beneficiário participou do evento" (filtros de relatório)
+            models.Index(fields=["beneficiary", "event"]),
+        ]
         verbose_name = "Presença"
         verbose_name_plural = "Presenças"
 
@@ -253,6 +296,8 @@ class Distribution(models.Model):
     period_month = models.DateField("Mês de referência", help_text="Use o primeiro dia do mês, ex.: 2025-05-01")
     delivered_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, verbose_name="Entregue por")
     delivered_at = models.DateTimeField(auto_now_add=True)
+    # Validadores de cache da API (ETag)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         constraints = [
@@ -263,6 +308,16 @@ class Distribution(models.Model):
                 name="uniq_distribution_per_beneficiary_product_month_network",
             ),
         ]
+        indexes = [
+            # Listagens/relatórios por ONG ordenados por data de entrega
+            models.Index(fields=["organization", "delivered_at"]),
+            # reports_page sem ONG: varredura do mais recente para trás até completar a página
+            models.Index(fields=["delivered_at"]),
+            # Regra de 30 dias em deliver_basket (beneficiário + produto + janela de datas)
+            models.Index(fields=["beneficiary", "product", "delivered_at"]),
+            # MAX(updated_at) por ONG para a ETag da API
+            models.Index(fields=["organization", "updated_at"]),
+        ]
         verbose_name = "Distribuição"
         verbose_name_plural = "Distribuições"
 
@@ -366,11 +421,92 @@ class AuditLog(models.Model):
     description = models.TextField(blank=True)
     ip_address = models.CharField(max_length=64, blank=True)
     user_agent = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # default (e não auto_now_add) para manter o instante da ação quando a
+    # gravação acontece depois, em lote (ver core.audit)
+    created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
-        indexes = [models.Index(fields=["user", "created_at"]) ]
+        indexes = [
+            models.Index(fields=["user", "created_at"]),
+            # audit_page por ONG e período, paginado por chave (panel.audit)
+            models.Index(fields=["organization", "created_at"]),
+            # audit_page sem ONG e corte da retenção (archive_audit_logs)
+            models.Index(fields=["created_at"]),
+            # busca por alvo ("quem mexeu no beneficiário 1234") e por ação
+            models.Index(fields=["model_name", "object_id", "created_at"]),
+            # busca só pelo id do objeto, sem modelo
+            models.Index(fields=["object_id", "created_at"]),
+            models.Index(fields=["action", "created_at"]),
+            # texto livre na descrição: índice trigram só no PostgreSQL (migração 0021)
+        ]
         ordering = ["-created_at"]
         verbose_name = "Auditoria"
         verbose_name_plural = "Auditorias"
 
+
+class ChangeLog(models.Model):
+    """Alterações de beneficiários e distribuições por ONG, para a sincronização da API.
+
+    Cada inclusão, alteração ou exclusão (tombstone, com `deleted`) ganha uma
+    linha; a ordem do feed é (txid, id), a de confirmação das transações. Ver
+    core.changes.
+    """
+    # Sem FK no banco: exclusões em cascata da ONG ainda gravam alterações
+    organization = models.ForeignKey(
+        Organization, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    model_name = models.CharField(max_length=32)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    # transação que gravou a linha (txid_current() no PostgreSQL; 0 nos demais bancos)
+    txid = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # /api/sync/?since=<txid>-<id> da ONG
+            models.Index(fields=["organization", "txid", "id"]),
+        ]
+        verbose_name = "Alteração"
+        verbose_name_plural = "Alterações"
+
+
+class ReportJob(models.Model):
+    """Exportação de relatório processada fora da requisição (run_report_worker)."""
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Na fila"
+        RUNNING = "RUNNING", "Em processamento"
+        DONE = "DONE", "Pronto"
+        FAILED = "FAILED", "Falhou"
+        EXPIRED = "EXPIRED", "Expirado"
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="report_jobs")
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, null=True, blank=True)
+    kind = models.CharField("Relatório", max_length=64)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    compress = models.BooleanField("Compactado (.gz)", default=False)
+    file_name = models.CharField(max_length=255, blank=True)
+    rows = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # renovado pelo worker durante a geração; sem renovação o job é dado como interrompido
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+    @property
+    def is_ready(self) -> bool:
+        return self.status == self.Status.DONE and (self.expires_at is None or self.expires_at > timezone.now())
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+            models.Index(fields=["user", "created_at"]),
+        ]
+        verbose_name = "Exportação de relatório"
+        verbose_name_plural = "Exportações de relatórios"
@@ -0,0 +1,51 @@
+"""Backend de sessão com poucas escritas.
+
+Com `SESSION_SAVE_EVERY_REQUEST` o Django regrava a sessão a cada request só
+para empurrar a expiração. Este backend (cache + banco, como o `cached_db`)
+só persiste quando os dados mudam ou quando a última gravação tem mais de
+`SESSION_REFRESH_SECONDS`. Nos demais requests a expiração continua deslizando
+no cookie, que o SessionMiddleware renova sempre.
+
+Para o servidor nunca expirar a sessão antes do cookie, cache e banco recebem
+a expiração acrescida da janela de renovação: a última gravação cobre qualquer
+request feito até `SESSION_REFRESH_SECONDS` depois dela.
+
+Uso: SESSION_ENGINE = "core.sessions"
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db
+
+# Instante (epoch) da última gravação, guardado junto dos dados da sessão
+SAVED_AT_KEY = "_session_saved_at"
+
+
+def _refresh_seconds() -> int:
+    return getattr(settings, "SESSION_REFRESH_SECONDS", 60)
+
+
+class SessionStore(cached_db.SessionStore):
+    def _refresh_due(self) -> bool:
+        saved_at = self._get_session().get(SAVED_AT_KEY)
+        return saved_at is None or time.time() - saved_at >= _refresh_seconds()
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        if not must_create and not self.modified and not self._refresh_due():
+            return
+        self._get_session(no_load=must_create)[SAVED_AT_KEY] = int(time.time())
+        # Grava no banco (DBStore) e no cache com o TTL estendido, no lugar do
+        # cached_db.save, que usaria a expiração sem folga
+        super(cached_db.SessionStore, self).save(must_create=must_create)
+        self._cache.set(self.cache_key, self._session, self.get_expiry_age() + _refresh_seconds())
+
+    def create_model_instance(self, data):
+        instance = super().create_model_instance(data)
+        instance.expire_date += timedelta(seconds=_refresh_seconds())
+        return instance
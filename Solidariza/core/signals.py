@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .analytics import invalidate_attendance_matrix, invalidate_distribution_pivot
+from .directory import invalidate_directory, invalidate_organization
+from .changes import BENEFICIARY, DISTRIBUTION, record_changes
+from .models import ApiToken, Attendance, Beneficiary, Distribution, Event, Organization, OrganizationBeneficiary
+from .tokens import invalidate_token, invalidate_user_tokens
+
+
+@receiver([post_save, post_delete], sender=Attendance)
+def attendance_changed(sender, instance, **kwargs):
+    try:
+        org_id = instance.event.organization_id
+    except Event.DoesNotExist:
+        org_id = None
+    # depois do commit: antes dele, outro worker remontaria a matriz com as presenças antigas
+    transaction.on_commit(partial(invalidate_attendance_matrix, org_id))
+
+
+@receiver([post_save, post_delete], sender=Event)
+def event_changed(sender, instance, **kwargs):
+    transaction.on_commit(partial(invalidate_attendance_matrix, instance.organization_id))
+
+
+@receiver([post_save, post_delete], sender=Distribution)
+def distribution_changed(sender, instance, **kwargs):
+    # depois do commit: antes dele, outro worker recalcularia o mês com os dados antigos
+    transaction.on_commit(partial(invalidate_distribution_pivot, instance.period_month))
+
+
+@receiver([post_save, post_delete], sender=Organization)
+def organization_changed(sender, instance, **kwargs):
+    invalidate_organization(instance.pk)
+    # depois do commit, para outro worker não recarregar a lista antiga com a versão nova
+    transaction.on_commit(invalidate_directory)
+
+
+@receiver([post_save, post_delete], sender=ApiToken)
+def api_token_changed(sender, instance, **kwargs):
+    invalidate_token(instance.key_hash)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # O login só grava last_login; o resto (ativo, ONG, papel) vale para os tokens em cache
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    invalidate_user_tokens(instance.pk)
+
+
+# --- Sequência de alterações (core.changes) ----------------------------------
+@receiver(post_save, sender=Beneficiary)
+def beneficiary_saved(sender, instance, **kwargs):
+    # Beneficiários são da rede: a alteração vale para todas as ONGs vinculadas
+    org_ids = OrganizationBeneficiary.objects.filter(beneficiary_id=instance.pk).values_list("organization_id", flat=True)
+    record_changes(org_ids, BENEFICIARY, [instance.pk])
+
+
+@receiver(post_save, sender=OrganizationBeneficiary)
+def beneficiary_linked(sender, instance, created, **kwargs):
+    if created:
+        record_changes([instance.organization_id], BENEFICIARY, [instance.beneficiary_id])
+
+
+@receiver(post_delete, sender=OrganizationBeneficiary)
+def beneficiary_unlinked(sender, instance, **kwargs):
+    # Também cobre a exclusão do beneficiário, que apaga os vínculos em cascata
+    record_changes([instance.organization_id], BENEFICIARY, [instance.beneficiary_id], deleted=True)
+
+
+@receiver(post_save, sender=Distribution)
+def distribution_saved(sender, instance, **kwargs):
+    record_changes([instance.organization_id], DISTRIBUTION, [instance.pk])
+
+
+@receiver(post_delete, sender=Distribution)
+def distribution_deleted(sender, instance, **kwargs):
+    record_changes([instance.organization_id], DISTRIBUTION, [instance.pk], deleted=True)
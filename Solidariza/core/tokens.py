@@ -0,0 +1,92 @@
+"""Tokens da API guardados por hash, com verificação em cache.
+
+A chave é aleatória (256 bits), então basta um SHA-256 para guardá-la: não há
+o que um hash lento de senha (PBKDF2) proteja, e o custo cai de dezenas de
+milissegundos para microssegundos. A verificação consulta o cache padrão pelo
+hash; só na falta (ou após `API_TOKEN_CACHE_TTL`) vai ao banco, quando também
+atualiza `last_used_at`. Revogação, alteração do token ou do usuário invalidam
+a entrada pelos sinais (ver core.signals).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import secrets
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import ApiToken
+
+
+TOKEN_PREFIX = "sz_"
+CACHE_PREFIX = "api_token"
+
+
+def hash_token(raw: str) -> str:
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _cache_key(key_hash: str) -> str:
+    return f"{CACHE_PREFIX}:{key_hash}"
+
+
+def _cache_ttl() -> int:
+    return getattr(settings, "API_TOKEN_CACHE_TTL", 300)
+
+
+def issue_token(*, user, name: str, expires_at=None, created_by=None) -> tuple[ApiToken, str]:
+    """Cria um token para `user` (na ONG dele). Retorna (token, chave); a chave não é guardada."""
+    raw = TOKEN_PREFIX + secrets.token_urlsafe(32)
+    token = ApiToken.objects.create(
+        user=user,
+        organization_id=user.organization_id,
+        name=name,
+        prefix=raw[:len(TOKEN_PREFIX) + 6],
+        key_hash=hash_token(raw),
+        expires_at=expires_at,
+        created_by=created_by,
+    )
+    return token, raw
+
+
+def resolve_token(raw: str):
+    """(usuário, token) de uma chave válida, ou None.
+
+    Válida = existe, não revogada, não expirada, usuário ativo e ainda na ONG
+    para a qual o token foi emitido.
+    """
+    key_hash = hash_token(raw)
+    key = _cache_key(key_hash)
+    entry = cache.get(key)
+    if entry is None:
+        token = (
+            ApiToken.objects.select_related("user")
+            .defer("user__password")
+            .filter(key_hash=key_hash, revoked_at__isnull=True)
+            .first()
+        )
+        # Chaves desconhecidas não vão para o cache: seriam só lixo de tentativas
+        if token is None:
+            return None
+        now = timezone.now()
+        ApiToken.objects.filter(pk=token.pk).update(last_used_at=now)
+        token.last_used_at = now
+        entry = (token.user, token)
+        cache.set(key, entry, _cache_ttl())
+    user, token = entry
+    if token.expires_at is not None and token.expires_at <= timezone.now():
+        return None
+    if not user.is_active or user.organization_id != token.organization_id:
+        return None
+    return user, token
+
+
+def invalidate_token(key_hash: str) -> None:
+    cache.delete(_cache_key(key_hash))
+
+
+def invalidate_user_tokens(user_id) -> None:
+    hashes = ApiToken.objects.filter(user_id=user_id).values_list("key_hash", flat=True)
+    cache.delete_many([_cache_key(key_hash) for key_hash in hashes])
@@ -5,4 +5,5 @@ class PanelConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "panel"
 
-
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,117 @@
+"""Consulta da auditoria com paginação por chave (keyset).
+
+A listagem é ordenada por (created_at, id) decrescente e cada página parte do
+último registro da anterior (`created_at < x OR (created_at = x AND id < y)`),
+em vez de OFFSET: o custo de abrir a página 1 ou a página 10.000 é o mesmo,
+servido pelos índices de created_at / (organization, created_at).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from panel.reports import filter_by_datetime_range
+
+
+AUDIT_PAGE_SIZE = 100
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def encode_cursor(log) -> str:
+    """Posição de um registro como "<microssegundos desde 1970>-<id>"."""
+    return f"{(log.created_at - _EPOCH) // timedelta(microseconds=1)}-{log.pk}"
+
+
+def decode_cursor(value) -> tuple[datetime, int] | None:
+    try:
+        micros, pk = (int(part) for part in str(value).split("-", 1))
+    except (TypeError, ValueError):
+        return None
+    return _EPOCH + timedelta(microseconds=micros), pk
+
+
+def filter_audit_logs(
+    qs,
+    *,
+    organization=None,
+    start=None,
+    end=None,
+    action=None,
+    model_name=None,
+    object_id=None,
+    user=None,
+    q=None,
+):
+    """Filtros estruturados da auditoria (tela e API), cada um coberto por um índice:
+
+    - ação: (action, created_at)
+    - alvo: (model_name, object_id, created_at), ou (object_id, created_at) só com o id
+    - usuário: (user, created_at); o termo é procurado como login e, se numérico,
+      também como id (um login só de dígitos continua sendo encontrado)
+    - texto livre na descrição: índice trigram (PostgreSQL)
+    """
+    if organization:
+        try:
+            qs = qs.filter(organization_id=int(organization))
+        except (TypeError, ValueError):
+            pass
+    if action:
+        qs = qs.filter(action=action.strip())
+    if model_name:
+        qs = qs.filter(model_name=model_name.strip())
+    if object_id:
+        qs = qs.filter(object_id=str(object_id).strip())
+    if user:
+        user = str(user).strip()
+        # login resolvido antes (índice único), para o filtro ficar só em user_id = ANY(...)
+        user_ids = list(get_user_model().objects.filter(username=user).values_list("id", flat=True))
+        if user.isdigit():
+            user_ids.append(int(user))
+        qs = qs.filter(user_id__in=user_ids)
+    if q and q.strip():
+        qs = qs.filter(description__icontains=q.strip())
+    return filter_by_datetime_range(qs, "created_at", start, end)
+
+
+# Parâmetros aceitos por filter_audit_logs na query string (tela e API)
+AUDIT_FILTERS = ("organization", "start", "end", "action", "model_name", "object_id", "user", "q")
+
+
+def audit_filters(params) -> dict:
+    return {name: params.get(name) or "" for name in AUDIT_FILTERS}
+
+
+def keyset_page(qs, *, before=None, after=None, size: int = AUDIT_PAGE_SIZE) -> dict:
+    """Uma página de registros (mais recentes primeiro) a partir de um cursor.
+
+    `before`: registros mais antigos que o cursor (próxima página);
+    `after`: registros mais novos que o cursor (página anterior).
+    """
+    after_key = decode_cursor(after) if after else None
+    before_key = decode_cursor(before) if before else None
+    if after_key:
+        created_at, pk = after_key
+        rows = list(
+            qs.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+            .order_by("created_at", "pk")[:size + 1]
+        )
+        has_newer = len(rows) > size
+        rows = rows[:size][::-1]
+        has_older = True
+    else:
+        if before_key:
+            created_at, pk = before_key
+            qs = qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+        rows = list(qs.order_by("-created_at", "-pk")[:size + 1])
+        has_older = len(rows) > size
+        rows = rows[:size]
+        has_newer = before_key is not None
+    return {
+        "rows": rows,
+        "older": encode_cursor(rows[-1]) if rows and has_older else None,
+        "newer": encode_cursor(rows[0]) if rows and has_newer else None,
+    }
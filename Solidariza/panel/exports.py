@@ -0,0 +1,231 @@
+"""Exportações CSV em streaming.
+
+Cada exportação declara nome do arquivo, cabeçalho e um gerador de linhas
+baseado em projeções `values_list()` percorridas com `.iterator(chunk_size=...)`.
+Nada é acumulado em memória: a resposta começa a sair assim que o primeiro
+lote é lido do banco.
+"""
+
+from __future__ import annotations
+
+import csv
+import zlib
+from datetime import date
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from django.http import StreamingHttpResponse
+
+from core.models import Attendance, Beneficiary, Distribution, FamilyMember
+
+
+CHUNK_SIZE = 2000
+# Quantos bytes de CSV acumular antes de passar ao compressor gzip
+GZIP_BUFFER_SIZE = 64 * 1024
+
+
+class Echo:
+    """Pseudo-buffer para o csv.writer: devolve a linha em vez de acumulá-la."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(header: Iterable, rows: Iterable[Iterable], *, bom: bool = True) -> Iterator[str]:
+    writer = csv.writer(Echo())
+    if bom:
+        yield "\ufeff"
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def gzip_chunks(lines: Iterable[str], *, level: int = 6) -> Iterator[bytes]:
+    """Comprime as linhas em gzip à medida que são geradas."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    buffer = []
+    size = 0
+    for line in lines:
+        data = line.encode("utf-8")
+        buffer.append(data)
+        size += len(data)
+        if size >= GZIP_BUFFER_SIZE:
+            out = compressor.compress(b"".join(buffer))
+            buffer, size = [], 0
+            if out:
+                yield out
+    yield compressor.compress(b"".join(buffer)) + compressor.flush()
+
+
+def stream_csv(filename: str, header: Iterable, rows: Iterable[Iterable], *, bom: bool = True, compress: bool = False) -> StreamingHttpResponse:
+    """Gera um CSV linha a linha sem montar o arquivo inteiro em memória.
+
+    Com `compress=True` o arquivo sai como .csv.gz, comprimido durante o streaming.
+    """
+    lines = csv_lines(header, rows, bom=bom)
+    if compress:
+        response = StreamingHttpResponse(gzip_chunks(lines), content_type="application/gzip")
+        filename = f"{filename}.gz"
+    else:
+        response = StreamingHttpResponse(lines, content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def chunked(iterable: Iterable, size: int = CHUNK_SIZE) -> Iterator[list]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# --- Helpers de linha ------------------------------------------------------------
+def age_on(birth_date, today: date) -> int | None:
+    if not birth_date:
+        return None
+    return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+
+
+def is_minor(birth_date, today: date) -> bool:
+    age = age_on(birth_date, today)
+    return age is not None and age < 18
+
+
+def minor_cutoff(today: date) -> date:
+    """Data de nascimento a partir da qual (exclusive) a pessoa é menor de idade."""
+    try:
+        return today.replace(year=today.year - 18)
+    except ValueError:  # 29/02
+        return today.replace(year=today.year - 18, day=28)
+
+
+def guardian_identifiers(family_ids) -> dict:
+    """Identificador do responsável de cada família, numa única consulta."""
+    rows = (
+        FamilyMember.objects.filter(family_id__in=set(family_ids), is_guardian=True)
+        .exclude(beneficiary__identifier="")
+        .order_by("family_id", "id")
+        .values_list("family_id", "beneficiary__identifier")
+    )
+    result = {}
+    for family_id, identifier in rows:
+        result.setdefault(family_id, identifier)
+    return result
+
+
+def identification(beneficiary_id, identifier, document, birth_date, guardian_identifier, today: date) -> str:
+    """Mesma prioridade do filtro `get_identification`, sobre valores já projetados."""
+    if identifier:
+        return identifier
+    if document:
+        return document
+    if guardian_identifier and is_minor(birth_date, today):
+        return f"Resp: {guardian_identifier}"
+    return f"ID: #{beneficiary_id}"
+
+
+ATTENDANCE_FIELDS = (
+    "event__name",
+    "event__date",
+    "beneficiary_id",
+    "beneficiary__name",
+    "beneficiary__identifier",
+    "beneficiary__document",
+    "beneficiary__birth_date",
+    "beneficiary__family_links__family_id",
+    "present",
+)
+
+
+def _attendance_rows(queryset) -> Iterator[tuple]:
+    """Presenças com a identificação resolvida; responsáveis buscados por lote."""
+    today = date.today()
+    rows = queryset.values_list(*ATTENDANCE_FIELDS).iterator(chunk_size=CHUNK_SIZE)
+    for chunk in chunked(rows):
+        needs_guardian = [
+            row[7] for row in chunk
+            if row[7] and not row[4] and not row[5] and is_minor(row[6], today)
+        ]
+        guardians = guardian_identifiers(needs_guardian) if needs_guardian else {}
+        for event_name, event_date, bid, name, identifier, document, birth_date, family_id, present in chunk:
+            yield (
+                event_name,
+                event_date,
+                bid,
+                name,
+                identification(bid, identifier, document, birth_date, guardians.get(family_id), today),
+                age_on(birth_date, today),
+                present,
+            )
+
+
+# --- Exportações -------------------------------------------------------------------
+def distributions_rows(org) -> Iterator[list]:
+    qs = (
+        Distribution.objects.filter(organization=org)
+        .order_by("-delivered_at")
+        .values_list("beneficiary__name", "product__name", "period_month", "delivered_at")
+    )
+    for beneficiary_name, product_name, period_month, delivered_at in qs.iterator(chunk_size=CHUNK_SIZE):
+        yield [beneficiary_name, product_name, period_month.strftime("%Y-%m"), delivered_at]
+
+
+def families_rows(org) -> Iterator[list]:
+    qs = (
+        FamilyMember.objects.order_by("family_id", "id")
+        .values_list("family_id", "family__name", "beneficiary__name", "relation", "is_guardian")
+    )
+    for family_id, family_name, member_name, relation, is_guardian in qs.iterator(chunk_size=CHUNK_SIZE):
+        yield [family_name or f"Família #{family_id}", member_name, relation, "sim" if is_guardian else "não"]
+
+
+def minors_rows(org) -> Iterator[list]:
+    today = date.today()
+    qs = (
+        Beneficiary.objects.filter(organization=org, birth_date__gt=minor_cutoff(today))
+        .order_by("id")
+        .values_list("name", "birth_date", "family_links__family__name")
+    )
+    for name, birth_date, family_name in qs.iterator(chunk_size=CHUNK_SIZE):
+        yield [name, birth_date, age_on(birth_date, today), family_name or ""]
+
+
+def events_rows(org) -> Iterator[list]:
+    qs = Attendance.objects.order_by("-event__date", "event_id", "id")
+    for event_name, event_date, bid, name, ident, _age, present in _attendance_rows(qs):
+        yield [event_name, event_date.strftime("%d/%m/%Y"), bid, name, ident, "Presente" if present else "Ausente"]
+
+
+def event_attendance_rows(event) -> Iterator[list]:
+    qs = Attendance.objects.filter(event=event).order_by("beneficiary__name", "id")
+    for _name, _date, bid, name, ident, age, present in _attendance_rows(qs):
+        yield [bid, name, ident, age if age is not None else "N/A", "Presente" if present else "Ausente"]
+
+
+class ReportExport:
+    def __init__(self, filename: str, header: list, rows: Callable[..., Iterable]):
+        self.filename = filename
+        self.header = header
+        self.rows = rows
+
+    def response(self, org, *, compress: bool = False) -> StreamingHttpResponse:
+        return stream_csv(self.filename, self.header, self.rows(org), compress=compress)
+
+
+# Downloads do reports_page (?download=<chave>)
+REPORT_EXPORTS = {
+    "distributions_csv": ReportExport(
+        "distribuicoes.csv", ["Beneficiário", "Produto", "Mês", "Entregue em"], distributions_rows
+    ),
+    "families_csv": ReportExport(
+        "familias.csv", ["Família", "Membro", "Relação", "Responsável?"], families_rows
+    ),
+    "minors_csv": ReportExport(
+        "menores.csv", ["Beneficiário", "Data de nascimento", "Idade", "Família"], minors_rows
+    ),
+    "events_csv": ReportExport(
+        "eventos_presencas.csv", ["Evento", "Data", "ID", "Participante", "Identificador", "Status"], events_rows
+    ),
+}
@@ -0,0 +1,84 @@
+"""Cache de fragmentos por linha nas listagens pesadas do painel.
+
+Cada linha de beneficiary_list, family_list, stock e organization_detail é
+renderizada dentro de `{% cache %}` com chave (tipo, id, versão da linha,
+geração, dia). A versão de cada linha é um número guardado no cache padrão,
+compartilhado entre os workers; os sinais em panel.signals apagam a versão
+quando o beneficiário, a família (ou seus membros/vínculos) ou o produto
+mudam, e a próxima renderização cria uma versão nova, ou seja, uma chave
+nova. A geração cobre mudanças que afetam todas as linhas (nomes de ONGs), e
+o dia cobre as idades calculadas.
+
+Os fragmentos ficam no cache "fragments" (memória local de cada worker por
+padrão); só as versões passam pelo cache compartilhado, em uma leitura
+`get_many` por página.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+
+FRAGMENT_CACHE = "fragments"
+CACHE_PREFIX = "panel_row"
+GENERATION_KEY = f"{CACHE_PREFIX}:generation"
+
+BENEFICIARY = "beneficiary"
+FAMILY = "family"
+PRODUCT = "product"
+
+
+def _version_key(kind: str, pk) -> str:
+    return f"{CACHE_PREFIX}:{kind}:{pk}"
+
+
+def row_versions(kind: str, ids: Iterable) -> dict:
+    """Versão atual de cada linha; linhas sem versão (novas ou invalidadas) ganham uma agora."""
+    keys = {pk: _version_key(kind, pk) for pk in ids}
+    if not keys:
+        return {}
+    found = cache.get_many(list(keys.values()))
+    missing = {key: time.time_ns() for key in keys.values() if key not in found}
+    if missing:
+        cache.set_many(missing, None)
+    return {pk: found.get(key) or missing[key] for pk, key in keys.items()}
+
+
+def attach_row_versions(kind: str, objects) -> None:
+    """Anota `row_version` em cada instância (para a chave do `{% cache %}`)."""
+    objects = list(objects)
+    versions = row_versions(kind, [obj.pk for obj in objects])
+    for obj in objects:
+        obj.row_version = versions[obj.pk]
+
+
+def invalidate_rows(kind: str, ids: Iterable) -> None:
+    keys = [_version_key(kind, pk) for pk in set(ids) if pk]
+    if keys:
+        cache.delete_many(keys)
+
+
+def fragment_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def invalidate_all_rows() -> None:
+    cache.set(GENERATION_KEY, time.time_ns(), None)
+
+
+def row_cache_context() -> dict:
+    """Variáveis comuns das chaves de fragmento, para o contexto do template."""
+    return {
+        "fragment_ttl": getattr(settings, "PANEL_FRAGMENT_CACHE_TTL", 3600),
+        "fragment_generation": fragment_generation(),
+        "today": timezone.localdate().isoformat(),
+    }
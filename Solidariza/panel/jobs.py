@@ -0,0 +1,131 @@
+"""Fila de exportações em segundo plano.
+
+O painel apenas grava um `ReportJob`; o comando `run_report_worker` reivindica
+os jobs pendentes, gera o arquivo em `REPORTS_STORAGE_DIR` com o mesmo motor
+de `panel.exports` e o disponibiliza para download até `expires_at`. Durante a
+geração o worker renova `heartbeat_at` a cada `REPORT_JOB_HEARTBEAT_SECONDS`;
+jobs em RUNNING sem renovação há mais de `REPORT_JOB_STALE_MINUTES` (worker
+encerrado no meio) são marcados como FAILED para o usuário poder pedir de novo.
+Exportações longas, mas vivas, não são afetadas.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import ReportJob
+from panel.exports import REPORT_EXPORTS, csv_lines, gzip_chunks
+
+
+def storage_dir() -> Path:
+    path = Path(settings.REPORTS_STORAGE_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def job_path(job: ReportJob) -> Path:
+    return Path(settings.REPORTS_STORAGE_DIR) / job.file_name
+
+
+def report_file_name(job: ReportJob) -> str:
+    return f"{job.pk}-{REPORT_EXPORTS[job.kind].filename}" + (".gz" if job.compress else "")
+
+
+def enqueue_report(user, organization, kind: str, *, compress: bool = False) -> ReportJob:
+    if kind not in REPORT_EXPORTS:
+        raise ValueError(f"Relatório desconhecido: {kind}")
+    return ReportJob.objects.create(user=user, organization=organization, kind=kind, compress=compress)
+
+
+def claim_next_job() -> ReportJob | None:
+    """Marca o job pendente mais antigo como RUNNING e o retorna."""
+    with transaction.atomic():
+        qs = ReportJob.objects.filter(status=ReportJob.Status.PENDING).order_by("created_at", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            qs = qs.select_for_update(skip_locked=True)
+        job = qs.first()
+        if job is None:
+            return None
+        job.status = ReportJob.Status.RUNNING
+        job.started_at = job.heartbeat_at = timezone.now()
+        job.save(update_fields=["status", "started_at", "heartbeat_at"])
+    return job
+
+
+def run_job(job: ReportJob) -> ReportJob:
+    export = REPORT_EXPORTS[job.kind]
+    job.file_name = report_file_name(job)
+    target = storage_dir() / job.file_name
+    partial = target.with_name(target.name + ".part")
+    rows = 0
+
+    interval = timedelta(seconds=settings.REPORT_JOB_HEARTBEAT_SECONDS)
+    next_beat = timezone.now() + interval
+
+    def counted(lines):
+        nonlocal rows, next_beat
+        for rows, line in enumerate(lines):
+            # o relógio só é consultado a cada 1000 linhas
+            if not rows % 1000 and timezone.now() >= next_beat:
+                ReportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now())
+                next_beat = timezone.now() + interval
+            yield line
+
+    try:
+        lines = counted(csv_lines(export.header, export.rows(job.organization)))
+        if job.compress:
+            with open(partial, "wb") as fh:
+                for chunk in gzip_chunks(lines):
+                    fh.write(chunk)
+        else:
+            with open(partial, "w", encoding="utf-8", newline="") as fh:
+                fh.writelines(lines)
+        partial.replace(target)
+    except Exception as exc:  # noqa: BLE001
+        partial.unlink(missing_ok=True)
+        job.status = ReportJob.Status.FAILED
+        job.error = str(exc)
+    else:
+        job.status = ReportJob.Status.DONE
+        # linhas de dados: desconta BOM e cabeçalho
+        job.rows = max(rows - 1, 0)
+        job.expires_at = timezone.now() + timedelta(hours=settings.REPORT_JOB_TTL_HOURS)
+    job.finished_at = timezone.now()
+    job.save(update_fields=["file_name", "status", "error", "rows", "expires_at", "finished_at"])
+    return job
+
+
+def fail_stale_jobs() -> int:
+    """Marca como FAILED os jobs em RUNNING sem heartbeat há mais de `REPORT_JOB_STALE_MINUTES`."""
+    limit = timezone.now() - timedelta(minutes=settings.REPORT_JOB_STALE_MINUTES)
+    stale = ReportJob.objects.filter(
+        Q(heartbeat_at__lt=limit) | Q(heartbeat_at__isnull=True, started_at__lt=limit),
+        status=ReportJob.Status.RUNNING,
+    )
+    for job in stale.only("id", "kind", "compress").iterator():
+        # arquivo parcial deixado pelo worker interrompido
+        (storage_dir() / f"{report_file_name(job)}.part").unlink(missing_ok=True)
+    return stale.update(
+        status=ReportJob.Status.FAILED,
+        error="Processamento interrompido; gere o relatório novamente.",
+        finished_at=timezone.now(),
+    )
+
+
+def purge_expired() -> int:
+    """Remove arquivos de jobs vencidos e marca-os como EXPIRED."""
+    expired = ReportJob.objects.filter(status=ReportJob.Status.DONE, expires_at__lte=timezone.now())
+    count = 0
+    for job in expired.only("id", "file_name").iterator():
+        if job.file_name:
+            job_path(job).unlink(missing_ok=True)
+        count += 1
+    if count:
+        expired.update(status=ReportJob.Status.EXPIRED)
+    return count
@@ -0,0 +1,89 @@
+import gzip
+import json
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import AuditLog
+
+
+ARCHIVE_FIELDS = (
+    "id",
+    "created_at",
+    "user_id",
+    "user__username",
+    "organization_id",
+    "organization__name",
+    "action",
+    "model_name",
+    "object_id",
+    "description",
+    "ip_address",
+    "user_agent",
+)
+
+
+class Command(BaseCommand):
+    help = "Arquiva em JSONL.gz e remove os registros de auditoria fora da retenção."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=None,
+            help="Dias de auditoria a manter no banco (padrão: AUDIT_LOG_RETENTION_DAYS).",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000, help="Linhas por lote de leitura/remoção.")
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        retention_days = options["retention_days"]
+        if retention_days is None:
+            retention_days = getattr(settings, "AUDIT_LOG_RETENTION_DAYS", 365)
+        cutoff = timezone.now() - timedelta(days=retention_days)
+        expired = AuditLog.objects.filter(created_at__lt=cutoff)
+        if not expired.exists():
+            self.stdout.write("Nada a arquivar.")
+            return
+
+        directory = Path(getattr(settings, "AUDIT_ARCHIVE_DIR", settings.BASE_DIR / "media" / "audit"))
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"audit-ate-{cutoff:%Y%m%d}-{timezone.now():%Y%m%d%H%M%S}.jsonl.gz"
+        partial = path.with_name(path.name + ".part")
+
+        # 1) grava o arquivo inteiro, lendo por chave (created_at, id) em lotes
+        archived = 0
+        last_id = None
+        with gzip.open(partial, "wt", encoding="utf-8") as fh:
+            position = None
+            while True:
+                qs = expired.order_by("created_at", "id")
+                if position is not None:
+                    created_at, pk = position
+                    qs = qs.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+                rows = list(qs.values(*ARCHIVE_FIELDS)[:batch_size])
+                if not rows:
+                    break
+                for row in rows:
+                    fh.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False))
+                    fh.write("\n")
+                archived += len(rows)
+                position = (rows[-1]["created_at"], rows[-1]["id"])
+                last_id = max(last_id or 0, max(row["id"] for row in rows))
+        os.replace(partial, path)
+
+        # 2) só depois do arquivo fechado, remove o que foi arquivado em lotes
+        deleted = 0
+        archived_qs = expired.filter(id__lte=last_id).order_by()
+        while True:
+            pks = list(archived_qs.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            deleted += AuditLog.objects.filter(pk__in=pks).delete()[0]
+        self.stdout.write(f"{archived} registro(s) arquivado(s) em {path}; {deleted} removido(s) do banco.")
@@ -0,0 +1,113 @@
+import time
+from datetime import date
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.messages.storage import default_storage
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.test import RequestFactory
+
+from accounts.models import User
+from core.models import (
+    Beneficiary,
+    Family,
+    FamilyMember,
+    Organization,
+    OrganizationBeneficiary,
+    Product,
+    StockMovement,
+)
+from panel import views
+from panel.fragments import FRAGMENT_CACHE
+
+
+class Command(BaseCommand):
+    help = "Compara a renderização das listagens do painel com o cache de fragmentos frio e quente."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0, help="Cria uma ONG com N beneficiários (em famílias de 3) antes de medir.")
+        parser.add_argument("--repeat", type=int, default=5, help="Execuções por cenário (vale o melhor tempo).")
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            self.seed(options["seed"])
+        org = (
+            Organization.objects.annotate(total=Count("beneficiaries")).order_by("-total").first()
+        )
+        user = User.objects.filter(is_superuser=True).first()
+        if org is None or user is None:
+            self.stderr.write("Sem dados ou sem superusuário. Use --seed N.")
+            return
+        factory = RequestFactory()
+        session_store = import_module(settings.SESSION_ENGINE).SessionStore
+
+        def call(view, *args):
+            request = factory.get("/")
+            request.user = user
+            request.session = session_store()
+            request.session["active_organization_id"] = org.id
+            request._messages = default_storage(request)
+            return view(request, *args)
+
+        pages = [
+            ("beneficiary_list", lambda: call(views.beneficiary_list)),
+            ("family_list", lambda: call(views.family_list)),
+            ("stock_page", lambda: call(views.stock_page)),
+            ("organization_detail", lambda: call(views.organization_detail, org.pk)),
+        ]
+        fragments = caches[FRAGMENT_CACHE]
+        self.stdout.write(f"ONG '{org.name}': {org.total} beneficiários")
+        self.stdout.write(f"{'Página':22} {'frio (ms)':>10} {'quente (ms)':>12} {'ganho':>7}")
+        for label, render in pages:
+            def cold():
+                fragments.clear()
+                render()
+            cold_ms = self.measure(cold, options["repeat"])
+            render()
+            warm_ms = self.measure(render, options["repeat"])
+            gain = cold_ms / warm_ms if warm_ms else 0
+            self.stdout.write(f"{label:22} {cold_ms:10.1f} {warm_ms:12.1f} {gain:6.1f}x")
+
+    def measure(self, fn, repeat: int) -> float:
+        best = None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            fn()
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def seed(self, total: int) -> None:
+        self.stdout.write(f"Semeando {total} beneficiários...")
+        with transaction.atomic():
+            user = User.objects.filter(is_superuser=True).first()
+            org = Organization.objects.create(name="Bench Fragmentos")
+            beneficiaries = Beneficiary.objects.bulk_create([
+                Beneficiary(
+                    name=f"Beneficiário Bench {i}",
+                    identifier=f"BFR{org.pk:04d}{i:07d}",
+                    birth_date=date(1950 + i % 70, 1 + i % 12, 1 + i % 28),
+                )
+                for i in range(total)
+            ])
+            OrganizationBeneficiary.objects.bulk_create(
+                [OrganizationBeneficiary(organization=org, beneficiary=b) for b in beneficiaries]
+            )
+            families = Family.objects.bulk_create([Family(name=f"família bench {i}") for i in range(total // 3)])
+            FamilyMember.objects.bulk_create([
+                FamilyMember(
+                    family=families[i // 3],
+                    beneficiary=b,
+                    relation=FamilyMember.Relation.SELF if i % 3 == 0 else FamilyMember.Relation.CHILD,
+                    is_guardian=i % 3 == 0,
+                )
+                for i, b in enumerate(beneficiaries[:len(families) * 3])
+            ])
+            for p in range(5):
+                product = Product.objects.create(organization=org, name=f"Bench Produto {p}")
+                StockMovement.objects.create(
+                    organization=org, product=product, kind=StockMovement.IN, quantity=100 * (p + 1), created_by=user
+                )
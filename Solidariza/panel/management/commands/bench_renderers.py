@@ -0,0 +1,70 @@
+import json
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.serializers import BeneficiarySerializer
+from core.models import Beneficiary
+
+
+class Command(BaseCommand):
+    help = "Compara o JSONRenderer do DRF com os renderers rápidos (orjson / MessagePack) numa lista de BeneficiarySerializer."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=10000, help="Tamanho da lista serializada.")
+        parser.add_argument("--repeat", type=int, default=5, help="Execuções por cenário (vale o melhor tempo).")
+
+    def handle(self, *args, **options):
+        # Instâncias em memória: mede só serialização/renderização, sem banco
+        beneficiaries = [
+            Beneficiary(
+                id=i,
+                name=f"Beneficiário {i}",
+                identifier=f"{i:011d}",
+                birth_date=date(1980 + i % 40, 1 + i % 12, 1 + i % 28),
+                cep="01001-000",
+                address="Praça da Sé",
+                address_number=str(i % 1000),
+                district="Sé",
+                city="São Paulo",
+                state="SP",
+            )
+            for i in range(1, options["items"] + 1)
+        ]
+        data = BeneficiarySerializer(beneficiaries, many=True).data
+        repeat = options["repeat"]
+        payload = JSONRenderer().render(data)
+
+        self.stdout.write(f"{options['items']} beneficiários ({len(payload) / 1024:.0f} KiB em JSON)")
+        self.stdout.write(f"orjson: {'sim' if renderers.orjson else 'não instalado (stdlib)'}; "
+                          f"msgpack: {'sim' if renderers.msgpack else 'não instalado'}")
+        self.stdout.write(f"{'Cenário':28} {'ms':>9} {'ganho':>7}")
+        baseline = self.measure(lambda: JSONRenderer().render(data), repeat)
+        self.report("render JSONRenderer (DRF)", baseline, baseline)
+        self.report("render FastJSONRenderer", self.measure(lambda: renderers.FastJSONRenderer().render(data), repeat), baseline)
+        if renderers.msgpack:
+            self.report("render MessagePackRenderer", self.measure(lambda: renderers.MessagePackRenderer().render(data), repeat), baseline)
+
+        parse_baseline = self.measure(lambda: json.loads(payload), repeat)
+        self.report("parse json (stdlib)", parse_baseline, parse_baseline)
+        if renderers.orjson:
+            self.report("parse orjson", self.measure(lambda: renderers.orjson.loads(payload), repeat), parse_baseline)
+        if renderers.msgpack:
+            packed = renderers.MessagePackRenderer().render(data)
+            self.report("parse msgpack", self.measure(lambda: renderers.msgpack.unpackb(packed, raw=False), repeat), parse_baseline)
+
+    def report(self, label: str, elapsed: float, baseline: float) -> None:
+        gain = baseline / elapsed if elapsed else 0
+        self.stdout.write(f"{label:28} {elapsed:9.1f} {gain:6.1f}x")
+
+    def measure(self, fn, repeat: int) -> float:
+        best = None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            fn()
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
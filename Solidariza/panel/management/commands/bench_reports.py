@@ -0,0 +1,143 @@
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import User
+from core.models import (
+    Attendance,
+    Beneficiary,
+    Distribution,
+    Event,
+    Organization,
+    OrganizationBeneficiary,
+    Product,
+)
+from panel.reports import filter_distributions
+
+
+MONTHS = 36
+PRODUCTS_PER_ORG = 2
+ORGS = 5
+
+
+def _legacy_filters(qs, *, filter_type="all", filter_value="", organization_filter=None, event_filter=None, start=None, end=None):
+    """Filtros como eram feitos no reports_page antes da reescrita (para comparação)."""
+    if filter_type == "cpf" and filter_value:
+        qs = qs.filter(beneficiary__identifier__icontains=filter_value)
+    elif filter_type == "name" and filter_value:
+        qs = qs.filter(beneficiary__name__icontains=filter_value)
+    elif filter_type == "events" and filter_value:
+        qs = qs.filter(beneficiary_id__in=Attendance.objects.filter(event__name__icontains=filter_value).values_list("beneficiary_id", flat=True))
+    if organization_filter:
+        qs = qs.filter(organization_id=organization_filter)
+    if event_filter:
+        qs = qs.filter(beneficiary_id__in=Attendance.objects.filter(event_id=event_filter).values_list("beneficiary_id", flat=True))
+    if start:
+        qs = qs.filter(delivered_at__date__gte=start)
+    if end:
+        qs = qs.filter(delivered_at__date__lte=end)
+    return qs
+
+
+class Command(BaseCommand):
+    help = "Compara os filtros do reports_page (antigos × indexados), opcionalmente semeando dados sintéticos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0, help="Cria aproximadamente N distribuições sintéticas antes de medir.")
+        parser.add_argument("--repeat", type=int, default=5, help="Execuções por cenário (vale o melhor tempo).")
+        parser.add_argument("--explain", action="store_true", help="Mostra o plano de execução das consultas indexadas.")
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            self.seed(options["seed"])
+        org_id = Distribution.objects.order_by("-delivered_at").values_list("organization_id", flat=True).first()
+        org = Organization.objects.filter(id=org_id).first()
+        if org is None:
+            self.stderr.write("Sem dados. Use --seed N.")
+            return
+        sample = Beneficiary.objects.filter(organizations__organization=org).order_by("-id").first()
+        event = Event.objects.filter(organization=org).order_by("-date").first()
+        today = timezone.localdate()
+        scenarios = [
+            ("ONG + período (90 dias)", {"organization_filter": org.id, "start": (today - timedelta(days=90)).isoformat(), "end": today.isoformat()}),
+            # trechos do meio/fim, como na busca por substring do painel
+            ("CPF (trecho)", {"filter_type": "cpf", "filter_value": sample.identifier[-6:] if sample else ""}),
+            ("Nome (trecho)", {"filter_type": "name", "filter_value": " ".join(sample.name.split()[1:]) if sample else ""}),
+            ("Evento (nome)", {"filter_type": "events", "filter_value": event.name if event else ""}),
+            ("Evento específico + período", {"event_filter": event.id if event else None, "start": (today - timedelta(days=365)).isoformat()}),
+        ]
+        base = Distribution.objects.select_related("beneficiary", "product", "organization").order_by("-delivered_at")
+        self.stdout.write(f"{'Cenário':32} {'antigo (ms)':>12} {'indexado (ms)':>14} {'ganho':>7}")
+        for label, params in scenarios:
+            legacy = self.measure(lambda: list(_legacy_filters(base, **params)[:200]), options["repeat"])
+            indexed = self.measure(lambda: list(filter_distributions(base, **params)[:200]), options["repeat"])
+            gain = legacy / indexed if indexed else 0
+            self.stdout.write(f"{label:32} {legacy:12.1f} {indexed:14.1f} {gain:6.1f}x")
+            if options["explain"]:
+                self.stdout.write(filter_distributions(base, **params)[:200].explain())
+
+    def measure(self, fn, repeat: int) -> float:
+        best = None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            fn()
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def seed(self, total: int) -> None:
+        rng = random.Random(42)
+        per_beneficiary = MONTHS * PRODUCTS_PER_ORG
+        beneficiaries_total = max(1, total // per_beneficiary)
+        first_month = date.today().replace(day=1)
+        months = []
+        for _ in range(MONTHS):
+            months.append(first_month)
+            first_month = (first_month - timedelta(days=1)).replace(day=1)
+        tz = timezone.get_current_timezone()
+        delivered_at = Distribution._meta.get_field("delivered_at")
+
+        self.stdout.write(f"Semeando ~{beneficiaries_total * per_beneficiary} distribuições...")
+        with transaction.atomic():
+            user = User.objects.filter(is_superuser=True).first()
+            orgs = [Organization.objects.create(name=f"Bench ONG {i}") for i in range(ORGS)]
+            products = {
+                o.id: [Product.objects.create(organization=o, name=f"Bench Produto {p}") for p in range(PRODUCTS_PER_ORG)]
+                for o in orgs
+            }
+            events = {
+                o.id: [Event.objects.create(organization=o, name=f"Bench Evento {m:%Y-%m}", date=m) for m in months]
+                for o in orgs
+            }
+            start_id = Beneficiary.objects.order_by("-id").values_list("id", flat=True).first() or 0
+            Beneficiary.objects.bulk_create(
+                [Beneficiary(name=f"Bench Pessoa {start_id + i}", identifier=f"{start_id + i:011d}") for i in range(beneficiaries_total)],
+                batch_size=5000,
+            )
+            beneficiaries = list(Beneficiary.objects.filter(name__startswith="Bench Pessoa", id__gt=start_id).values_list("id", flat=True))
+
+        # auto_now_add sobrescreveria as datas históricas no bulk_create
+        delivered_at.auto_now_add = False
+        try:
+            for offset in range(0, len(beneficiaries), 1000):
+                batch = beneficiaries[offset:offset + 1000]
+                links, dists, atts = [], [], []
+                for bid in batch:
+                    org = orgs[bid % ORGS]
+                    links.append(OrganizationBeneficiary(organization=org, beneficiary_id=bid))
+                    for m_index, month in enumerate(months):
+                        when = timezone.make_aware(datetime.combine(month, datetime.min.time()), tz) + timedelta(hours=rng.randint(8, 24 * 27))
+                        for product in products[org.id]:
+                            dists.append(Distribution(organization=org, beneficiary_id=bid, product=product, period_month=month, delivered_at=when, delivered_by=user))
+                        atts.append(Attendance(event=events[org.id][m_index], beneficiary_id=bid, present=rng.random() > 0.2))
+                with transaction.atomic():
+                    OrganizationBeneficiary.objects.bulk_create(links)
+                    Distribution.objects.bulk_create(dists, batch_size=5000)
+                    Attendance.objects.bulk_create(atts, batch_size=5000)
+        finally:
+            delivered_at.auto_now_add = True
+        self.stdout.write("Dados semeados.")
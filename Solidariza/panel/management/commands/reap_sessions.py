@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import UserSession
+
+
+def delete_in_batches(queryset, batch_size: int) -> int:
+    """Apaga por lotes de chaves primárias, sem um DELETE gigante numa transação só."""
+    model = queryset.model
+    total = 0
+    while True:
+        pks = list(queryset.order_by().values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return total
+        model.objects.filter(pk__in=pks).delete()
+        total += len(pks)
+
+
+def update_in_batches(queryset, batch_size: int, **values) -> int:
+    model = queryset.model
+    total = 0
+    while True:
+        pks = list(queryset.order_by().values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return total
+        total += model.objects.filter(pk__in=pks).update(**values)
+
+
+class Command(BaseCommand):
+    help = "Encerra sessões sem atividade e remove sessões expiradas ou fora da retenção."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Linhas por lote de UPDATE/DELETE.")
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=None,
+            help="Dias de histórico de UserSession a manter (padrão: USER_SESSION_RETENTION_DAYS).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        retention_days = options["retention_days"]
+        if retention_days is None:
+            retention_days = getattr(settings, "USER_SESSION_RETENTION_DAYS", 90)
+        now = timezone.now()
+
+        # Sem atividade além da expiração do cookie (mais o atraso do heartbeat):
+        # a sessão já morreu no navegador
+        idle = (
+            settings.SESSION_COOKIE_AGE
+            + getattr(settings, "USER_SESSION_HEARTBEAT_SECONDS", 60)
+            + getattr(settings, "USER_SESSION_FLUSH_SECONDS", 10)
+        )
+        closed = update_in_batches(
+            UserSession.objects.filter(is_active=True, last_seen__lt=now - timedelta(seconds=idle)),
+            batch_size,
+            is_active=False,
+        )
+        expired = delete_in_batches(Session.objects.filter(expire_date__lt=now), batch_size)
+        purged = delete_in_batches(
+            UserSession.objects.filter(last_seen__lt=now - timedelta(days=retention_days)),
+            batch_size,
+        )
+        self.stdout.write(
+            f"{closed} sessão(ões) encerrada(s) por inatividade, "
+            f"{expired} sessão(ões) do Django expirada(s) removida(s), "
+            f"{purged} registro(s) de UserSession com mais de {retention_days} dias removido(s)."
+        )
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from panel.jobs import claim_next_job, fail_stale_jobs, purge_expired, run_job
+
+
+class Command(BaseCommand):
+    help = "Processa as exportações de relatórios enfileiradas pelo painel."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Processa a fila atual e encerra.")
+        parser.add_argument("--sleep", type=float, default=5.0, help="Intervalo (s) entre verificações da fila vazia.")
+
+    def handle(self, *args, **options):
+        once = options["once"]
+        sleep = options["sleep"]
+        while True:
+            close_old_connections()
+            stale = fail_stale_jobs()
+            if stale:
+                self.stdout.write(f"{stale} exportação(ões) interrompida(s) marcada(s) como falha.")
+            purged = purge_expired()
+            if purged:
+                self.stdout.write(f"{purged} exportação(ões) expirada(s) removida(s).")
+            job = claim_next_job()
+            if job is None:
+                if once:
+                    return
+                time.sleep(sleep)
+                continue
+            job = run_job(job)
+            self.stdout.write(f"Job #{job.pk} {job.kind}: {job.status} ({job.rows} linhas)")
@@ -0,0 +1,96 @@
+"""Filtros do reports_page escritos para aproveitar os índices.
+
+- Datas viram intervalos semiabertos [início, fim + 1 dia) no fuso local, em vez
+  de `delivered_at__date`, que aplica um cast na coluna e impede o uso do índice.
+- CPF/identificador, nome do beneficiário e nome do evento continuam sendo
+  busca por trecho (`icontains`), resolvida primeiro nas tabelas pequenas
+  (Beneficiary/Event) e aplicada como subconsulta IN por beneficiary_id. No
+  PostgreSQL, o nome do evento tem índice GIN trigram sobre `UPPER(name)`
+  (migração 0021); nome e CPF do beneficiário não, porque na medição o índice
+  não ganhou da varredura. O CPF é normalizado como é gravado.
+- Evento específico usa EXISTS sobre o índice Attendance(beneficiary, event).
+
+Medição: `manage.py bench_reports --seed 1000000 [--explain]` (ver panel/management/commands).
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date, datetime, time, timedelta
+
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from core.models import Attendance, Beneficiary, Event
+from core.validators import normalize_identifier, only_digits
+
+
+def parse_date(value) -> date | None:
+    try:
+        return date.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def local_day_start(day: date) -> datetime:
+    """Meia-noite do dia no fuso configurado (TIME_ZONE), como datetime aware."""
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_current_timezone())
+
+
+def datetime_range(start, end) -> tuple[datetime | None, datetime | None]:
+    """Converte datas (inclusive) em limites [início, fim) para colunas DateTime."""
+    start_day = parse_date(start)
+    end_day = parse_date(end)
+    return (
+        local_day_start(start_day) if start_day else None,
+        local_day_start(end_day + timedelta(days=1)) if end_day else None,
+    )
+
+
+def filter_by_datetime_range(qs, field: str, start, end):
+    lower, upper = datetime_range(start, end)
+    if lower is not None:
+        qs = qs.filter(**{f"{field}__gte": lower})
+    if upper is not None:
+        qs = qs.filter(**{f"{field}__lt": upper})
+    return qs
+
+
+def identifier_term(value: str) -> str:
+    """Normaliza o termo de busca como o identificador é gravado (CPF só com dígitos)."""
+    if re.fullmatch(r"[\d.\-/\s]+", value.strip()):
+        return only_digits(value)
+    return normalize_identifier(value)
+
+
+def _attended(events):
+    return Exists(Attendance.objects.filter(beneficiary_id=OuterRef("beneficiary_id"), event__in=events))
+
+
+def _attendees(events):
+    return Attendance.objects.filter(event__in=events).values("beneficiary_id")
+
+
+def filter_distributions(qs, *, org=None, filter_type="all", filter_value="", organization_filter=None, event_filter=None, start=None, end=None):
+    if filter_type == "cpf" and filter_value:
+        qs = qs.filter(beneficiary_id__in=Beneficiary.objects.filter(identifier__icontains=identifier_term(filter_value)).values("id"))
+    elif filter_type == "name" and filter_value:
+        qs = qs.filter(beneficiary_id__in=Beneficiary.objects.filter(name__icontains=filter_value).values("id"))
+    elif filter_type == "id" and filter_value:
+        try:
+            qs = qs.filter(beneficiary_id=int(filter_value))
+        except ValueError:
+            pass
+    elif filter_type == "org":
+        qs = qs.filter(organization=org)
+    elif filter_type == "events" and filter_value:
+        qs = qs.filter(beneficiary_id__in=_attendees(Event.objects.filter(name__icontains=filter_value).values("id")))
+
+    if organization_filter:
+        qs = qs.filter(organization_id=organization_filter)
+    if event_filter:
+        try:
+            qs = qs.filter(_attended([int(event_filter)]))
+        except ValueError:
+            pass
+    return filter_by_datetime_range(qs, "delivered_at", start, end)
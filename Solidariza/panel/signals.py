@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Beneficiary, Family, FamilyMember, Organization, OrganizationBeneficiary, Product
+from .fragments import BENEFICIARY, FAMILY, PRODUCT, invalidate_all_rows, invalidate_rows
+
+
+# Invalidações depois do commit: antes dele, outro worker ainda renderizaria os dados antigos com a versão nova
+def _invalidate(kind: str, ids) -> None:
+    transaction.on_commit(partial(invalidate_rows, kind, list(ids)))
+
+
+def _families_of(beneficiary_id) -> list[tuple[int, int]]:
+    """(família, beneficiário) de todos os membros das famílias do beneficiário."""
+    return list(
+        FamilyMember.objects.filter(family__members__beneficiary_id=beneficiary_id).values_list("family_id", "beneficiary_id")
+    )
+
+
+@receiver(post_save, sender=Beneficiary)
+def beneficiary_row_changed(sender, instance, **kwargs):
+    # A linha de um menor mostra o identificador do responsável: os outros membros também mudam
+    members = _families_of(instance.pk)
+    _invalidate(BENEFICIARY, {instance.pk} | {beneficiary_id for _family_id, beneficiary_id in members})
+    _invalidate(FAMILY, {family_id for family_id, _beneficiary_id in members})
+
+
+@receiver([post_save, post_delete], sender=FamilyMember)
+def family_member_row_changed(sender, instance, **kwargs):
+    members = set(FamilyMember.objects.filter(family_id=instance.family_id).values_list("beneficiary_id", flat=True))
+    _invalidate(BENEFICIARY, members | {instance.beneficiary_id})
+    _invalidate(FAMILY, [instance.family_id])
+
+
+@receiver([post_save, post_delete], sender=Family)
+def family_row_changed(sender, instance, **kwargs):
+    _invalidate(FAMILY, [instance.pk])
+
+
+@receiver([post_save, post_delete], sender=OrganizationBeneficiary)
+def beneficiary_link_row_changed(sender, instance, **kwargs):
+    # A listagem de famílias mostra as ONGs dos membros
+    _invalidate(FAMILY, {family_id for family_id, _beneficiary_id in _families_of(instance.beneficiary_id)})
+
+
+@receiver([post_save, post_delete], sender=Product)
+def product_row_changed(sender, instance, **kwargs):
+    _invalidate(PRODUCT, [instance.pk])
+
+
+@receiver([post_save, post_delete], sender=Organization)
+def organization_row_changed(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_all_rows)
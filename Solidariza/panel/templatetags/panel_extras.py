@@ -1,7 +1,7 @@
 from django import template
 from datetime import date, timedelta
+from core.directory import list_organizations
 from core.middleware import get_active_organization
-from core.models import Organization
 
 register = template.Library()
 
@@ -114,9 +114,9 @@ def active_organization_name(context):
 
 @register.simple_tag(takes_context=True)
 def list_all_organizations(context):
-    """Retorna todas as organizações para o seletor do admin global."""
+    """Retorna todas as organizações para o seletor do admin global (diretório em memória)."""
     try:
-        return Organization.objects.all().order_by("name")
+        return list_organizations()
     except Exception:
         return []
 
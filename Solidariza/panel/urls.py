@@ -22,13 +22,20 @@ urlpatterns = [
     path("collaborators/<int:pk>/", views.collaborator_detail, name="collaborator_detail"),
     path("collaborators/<int:pk>/edit/", views.collaborator_edit, name="collaborator_edit"),
     path("collaborators/<int:pk>/delete/", views.collaborator_delete, name="collaborator_delete"),
+    path("api-tokens/", views.api_tokens_page, name="api_tokens_page"),
+    path("api-tokens/<int:pk>/revoke/", views.api_token_revoke, name="api_token_revoke"),
     path("reports/", views.reports_page, name="reports_page"),
+    path("reports/attendance/", views.attendance_report, name="attendance_report"),
+    path("reports/pivot/", views.distribution_pivot_report, name="distribution_pivot"),
+    path("reports/jobs/new/", views.report_job_create, name="report_job_create"),
+    path("reports/jobs/<int:pk>/download/", views.report_job_download, name="report_job_download"),
     path("families/", views.family_list, name="family_list"),
     path("families/new/", views.family_create, name="family_create"),
     path("events/", views.events_list, name="events_list"),
     path("events/new/", views.event_create, name="event_create"),
     path("events/<int:pk>/", views.event_attendance, name="event_attendance"),
     path("events/<int:pk>/summary/", views.event_summary, name="event_summary"),
+    path("events/<int:pk>/summary/csv/", views.event_summary_csv, name="event_summary_csv"),
     path("stock/", views.stock_page, name="stock_page"),
     path("distribuicoes-rede/", views.network_distributions, name="network_distributions"),
     path("sessions/", views.sessions_page, name="sessions_page"),
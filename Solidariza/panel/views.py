@@ -1,4 +1,5 @@
 from datetime import date
+from importlib import import_module
 import os
 from pathlib import Path
 
@@ -21,13 +22,28 @@ from core.models import (
     Attendance,
 )
 from django.db import transaction
+from core.directory import get_organization, list_organizations
 from core.middleware import get_active_organization
 from accounts.models import User
 from django.utils import timezone
 from django.http import HttpResponseBadRequest
-from django.contrib.sessions.models import Session
-from core.models import UserSession
+from core.models import ApiToken, ReportJob, UserSession
+from core.tokens import issue_token
 from core.audit import log_action
+from core import heartbeat
+from panel.audit import audit_filters, filter_audit_logs, keyset_page
+from panel.fragments import BENEFICIARY, FAMILY, PRODUCT, attach_row_versions, row_cache_context, row_versions
+from panel.exports import REPORT_EXPORTS, event_attendance_rows, stream_csv
+from panel.jobs import enqueue_report, job_path
+from panel.reports import filter_distributions
+
+
+# Tamanho de página do resumo de eventos
+EVENT_SUMMARY_PAGE_SIZE = 50
+# Tamanho de página do histórico de sessões (range=all)
+SESSIONS_PAGE_SIZE = 100
+# Limite de colunas (meses) do pivô de distribuições
+PIVOT_MAX_MONTHS = 240
 
 
 # --- Helpers de permissão ----------------------------------------------------
@@ -132,19 +148,20 @@ def set_active_organization(request):
             messages.success(request, "Visualizando toda a rede.")
             log_action(request.user, request, "set_active_org", description="Toda a Rede")
             return redirect("panel:dashboard")
-        try:
-            org = Organization.objects.get(id=org_id)
+        org = get_organization(org_id)
+        if org:
             request.session["active_organization_id"] = org.id
             messages.success(request, f"Organização ativa: {org.name}")
             log_action(request.user, request, "set_active_org", model_name="Organization", object_id=org.id, description=org.name, organization=org)
-        except Organization.DoesNotExist:
+        else:
             messages.error(request, "Organização não encontrada.")
         return redirect("panel:dashboard")
 
     # Usuário não-superuser: só pode setar sua própria org
-    if hasattr(request.user, "organization") and request.user.organization:
-        request.session["active_organization_id"] = request.user.organization.id
-        log_action(request.user, request, "set_active_org", model_name="Organization", object_id=request.user.organization.id, description=request.user.organization.name, organization=request.user.organization)
+    org = get_organization(request.user.organization_id)
+    if org:
+        request.session["active_organization_id"] = org.id
+        log_action(request.user, request, "set_active_org", model_name="Organization", object_id=org.id, description=org.name, organization=org)
         return redirect("panel:dashboard")
 
     messages.error(request, "Sem organização vinculada ao usuário.")
@@ -224,8 +241,11 @@ def beneficiary_list(request):
                     if member.beneficiary == beneficiary and member.is_guardian:
                         guardians += 1
                         break
+    # Chaves do cache de fragmento de cada linha (panel.fragments)
+    attach_row_versions(BENEFICIARY, beneficiaries)
     
     context = {
+        **row_cache_context(),
         "beneficiaries": beneficiaries,
         "total_beneficiaries": total_beneficiaries,
         "active_beneficiaries": active_beneficiaries,
@@ -578,8 +598,12 @@ def stock_page(request):
     # Estatísticas gerais
     products_in_critical = sum(1 for item in stock_data if item['status'] in ['empty', 'critical'])
     products_low = sum(1 for item in stock_data if item['status'] == 'low')
+    versions = row_versions(PRODUCT, [item['product'].pk for item in stock_data])
+    for item in stock_data:
+        item['row_version'] = versions[item['product'].pk]
     
     context = {
+        **row_cache_context(),
         "products": products,
         "stock_data": stock_data,
         "movements": movements,
@@ -615,7 +639,7 @@ def network_distributions(request):
     # Estatísticas da rede
     total_beneficiaries = Beneficiary.objects.count()
     total_distributions = Distribution.objects.count()
-    total_organizations = Organization.objects.count()
+    total_organizations = len(list_organizations())
     
     context = {
         "recent_distributions": recent_distributions[:100],  # Limitar para performance
@@ -633,11 +657,16 @@ def sessions_page(request):
         messages.error(request, "Acesso negado.")
         return redirect("panel:dashboard")
     from datetime import timedelta
+    from django.core.paginator import Paginator
     now = timezone.now()
     rng = (request.GET.get("range") or "5").strip()
     valid = {"5": 5, "15": 15, "30": 30}
     if rng == "all":
-        sessions = UserSession.objects.select_related("user", "organization").order_by("-last_seen")
+        # Histórico limitado pela retenção (reap_sessions), ainda assim paginado
+        sessions = Paginator(
+            UserSession.objects.select_related("user", "organization").order_by("-last_seen"),
+            SESSIONS_PAGE_SIZE,
+        ).get_page(request.GET.get("page"))
     else:
         minutes = valid.get(rng, 5)
         online_threshold = now - timedelta(minutes=minutes)
@@ -646,7 +675,8 @@ def sessions_page(request):
             .filter(last_seen__gte=online_threshold, is_active=True)
             .order_by("-last_seen")
         )
-    return render(request, "panel/sessions.html", {"sessions": sessions, "now": now, "range": rng})
+    page_obj = sessions if rng == "all" else None
+    return render(request, "panel/sessions.html", {"sessions": sessions, "page_obj": page_obj, "now": now, "range": rng})
 
 
 @login_required
@@ -661,9 +691,11 @@ def session_terminate(request):
         messages.error(request, "Chave de sessão não informada.")
         return redirect("panel:sessions_page")
     # Encerrar: marca como inativa e apaga a sessão do Django se existir
+    heartbeat.forget(key)
     UserSession.objects.filter(session_key=key).update(is_active=False)
     try:
-        Session.objects.filter(session_key=key).delete()
+        # Pelo backend configurado, para remover também a cópia em cache
+        import_module(settings.SESSION_ENGINE).SessionStore().delete(key)
     except Exception:
         pass
     log_action(request.user, request, "session_terminate", model_name="UserSession", object_id=key, description="Encerrar sessão")
@@ -676,23 +708,26 @@ def audit_page(request):
     if not request.user.is_superuser:
         messages.error(request, "Acesso negado.")
         return redirect("panel:dashboard")
-    from core.models import AuditLog, Organization
-    qs = AuditLog.objects.select_related("user", "organization").order_by("-created_at")
-    org_id = request.GET.get("organization")
-    start = request.GET.get("start")
-    end = request.GET.get("end")
-    if org_id:
-        try:
-            qs = qs.filter(organization_id=int(org_id))
-        except Exception:
-            pass
-    if start:
-        qs = qs.filter(created_at__date__gte=start)
-    if end:
-        qs = qs.filter(created_at__date__lte=end)
-    logs = qs[:500]
-    orgs = Organization.objects.all().order_by("name")
-    return render(request, "panel/audit.html", {"logs": logs, "organizations": orgs, "organization": org_id or "", "start": start or "", "end": end or ""})
+    from core.models import AuditLog
+    filters = audit_filters(request.GET)
+    qs = filter_audit_logs(AuditLog.objects.select_related("user", "organization"), **filters)
+    page = keyset_page(qs, before=request.GET.get("before"), after=request.GET.get("after"))
+    orgs = list_organizations()
+    params = request.GET.copy()
+    for key in ("before", "after"):
+        params.pop(key, None)
+    return render(
+        request,
+        "panel/audit.html",
+        {
+            "logs": page["rows"],
+            "older": page["older"],
+            "newer": page["newer"],
+            "filters_query": params.urlencode(),
+            "organizations": orgs,
+            "filters": filters,
+        },
+    )
 
 @login_required
 def organization_page(request):
@@ -806,8 +841,10 @@ def organization_detail(request, pk):
     org = get_object_or_404(Organization, pk=pk)
     collaborators = User.objects.filter(organization=org).order_by("first_name", "last_name")
     beneficiaries = Beneficiary.objects.filter(organizations__organization=org).order_by("name")
+    attach_row_versions(BENEFICIARY, beneficiaries)
     
     context = {
+        **row_cache_context(),
         "org": org,
         "collaborators": collaborators,
         "beneficiaries": beneficiaries,
@@ -903,10 +940,7 @@ def collaborator_create(request):
         role = request.POST.get("role")
         email = request.POST.get("email")
         org_id = request.POST.get("organization_id")
-        try:
-            org = Organization.objects.get(id=org_id)
-        except Exception:
-            org = get_active_organization(request)
+        org = get_organization(org_id) or get_active_organization(request)
         if username and password and role:
             u = User.objects.create_user(username=username, password=password, email=email, organization=org, role=role)
             log_action(
@@ -921,8 +955,7 @@ def collaborator_create(request):
             messages.success(request, "Colaborador criado.")
             return redirect("panel:collaborator_detail", pk=u.pk)
         messages.error(request, "Preencha os campos obrigatórios.")
-    orgs = Organization.objects.all().order_by("name")
-    return render(request, "panel/collaborator_create.html", {"orgs": orgs})
+    return render(request, "panel/collaborator_create.html", {"orgs": list_organizations()})
 
 
 @login_required
@@ -930,7 +963,7 @@ def collaborator_detail(request, pk: int):
     if request.user.is_superuser:
         u = get_object_or_404(User, pk=pk)
     else:
-        u = get_object_or_404(User, pk=pk, organization=request.user.organization)
+        u = get_object_or_404(User, pk=pk, organization_id=request.user.organization_id)
     return render(request, "panel/collaborator_detail.html", {"user_obj": u})
 
 
@@ -945,10 +978,7 @@ def collaborator_edit(request, pk: int):
         org_id = request.POST.get("organization_id")
         role = request.POST.get("role")
         if org_id:
-            try:
-                u.organization = Organization.objects.get(id=org_id)
-            except Organization.DoesNotExist:
-                pass
+            u.organization = get_organization(org_id) or u.organization
         if role:
             u.role = role
         u.save()
@@ -963,8 +993,7 @@ def collaborator_edit(request, pk: int):
         )
         messages.success(request, "Colaborador atualizado.")
         return redirect("panel:collaborator_detail", pk=u.pk)
-    orgs = Organization.objects.all().order_by("name")
-    return render(request, "panel/collaborator_edit.html", {"user_obj": u, "orgs": orgs})
+    return render(request, "panel/collaborator_edit.html", {"user_obj": u, "orgs": list_organizations()})
 
 
 @login_required
@@ -993,112 +1022,86 @@ def collaborator_delete(request, pk: int):
     return render(request, "panel/collaborator_delete_confirm.html", {"user_obj": u})
 
 
+@login_required
+@require_admin
+def api_tokens_page(request):
+    """Tokens da API da ONG ativa: emissão (a chave aparece só uma vez) e revogação."""
+    org = get_active_organization(request)
+    members = User.objects.filter(organization=org, is_active=True).order_by("username") if org else User.objects.none()
+    new_key = None
+    if request.method == "POST":
+        name = (request.POST.get("name") or "").strip()
+        owner = members.filter(pk=request.POST.get("user_id") or 0).first()
+        try:
+            days = int(request.POST.get("expires_days") or 0)
+        except ValueError:
+            days = -1
+        if not name or owner is None or days < 0:
+            messages.error(request, "Informe nome, usuário e validade (dias, 0 = sem expiração).")
+        else:
+            from datetime import timedelta
+            expires_at = timezone.now() + timedelta(days=days) if days else None
+            token, new_key = issue_token(user=owner, name=name, expires_at=expires_at, created_by=request.user)
+            log_action(
+                request.user,
+                request,
+                "api_token_create",
+                model_name="ApiToken",
+                object_id=token.id,
+                description=f"{token.name} ({owner.username})",
+                organization=org,
+            )
+            messages.success(request, "Token criado. Copie a chave agora: ela não será exibida novamente.")
+    tokens = (
+        ApiToken.objects.filter(organization=org).select_related("user").order_by("-created_at")
+        if org else ApiToken.objects.none()
+    )
+    return render(
+        request,
+        "panel/api_tokens.html",
+        {
+            "tokens": tokens,
+            "members": members,
+            "new_key": new_key,
+            "default_days": settings.API_TOKEN_DEFAULT_DAYS,
+        },
+    )
+
+
+@login_required
+@require_admin
+def api_token_revoke(request, pk: int):
+    if request.method != "POST":
+        return HttpResponseBadRequest("Método inválido")
+    org = get_active_organization(request)
+    token = get_object_or_404(ApiToken, pk=pk, organization=org)
+    if token.revoked_at is None:
+        token.revoked_at = timezone.now()
+        # save() dispara o sinal que tira o token do cache
+        token.save(update_fields=["revoked_at"])
+        log_action(
+            request.user,
+            request,
+            "api_token_revoke",
+            model_name="ApiToken",
+            object_id=token.id,
+            description=token.name,
+            organization=org,
+        )
+    messages.success(request, "Token revogado.")
+    return redirect("panel:api_tokens_page")
+
+
 @login_required
 def reports_page(request):
     org = get_active_organization(request)
-    # CSV simples: lista de distribuições por mês
-    if request.GET.get("download") == "distributions_csv":
-        if not (request.user.is_superuser or request.user.role in {User.Role.ADMIN, User.Role.MANAGER}):
-            messages.error(request, "Acesso negado ao download.")
-            return redirect("panel:reports_page")
-        from django.http import HttpResponse
-        import csv
-
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = "attachment; filename=distribuicoes.csv"
-        writer = csv.writer(response)
-        writer.writerow(["Beneficiário", "Produto", "Mês", "Entregue em"])
-        for d in Distribution.objects.filter(organization=org).order_by("-delivered_at"):
-            writer.writerow([d.beneficiary.name, d.product.name, d.period_month.strftime("%Y-%m"), d.delivered_at])
-        return response
-
-    if request.GET.get("download") == "families_csv":
-        if not (request.user.is_superuser or request.user.role in {User.Role.ADMIN, User.Role.MANAGER}):
-            messages.error(request, "Acesso negado ao download.")
-            return redirect("panel:reports_page")
-        from django.http import HttpResponse
-        import csv
-
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = "attachment; filename=familias.csv"
-        writer = csv.writer(response)
-        writer.writerow(["Família", "Membro", "Relação", "Responsável?"])
-        for fam in Family.objects.all():
-            for m in fam.members.select_related("beneficiary"):
-                writer.writerow([fam.name or f"Família #{fam.id}", m.beneficiary.name, m.relation, "sim" if m.is_guardian else "não"])
-        return response
-
-    if request.GET.get("download") == "minors_csv":
-        if not (request.user.is_superuser or request.user.role in {User.Role.ADMIN, User.Role.MANAGER}):
-            messages.error(request, "Acesso negado ao download.")
-            return redirect("panel:reports_page")
-        from django.http import HttpResponse
-        import csv
-        from datetime import date as dt
-
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = "attachment; filename=menores.csv"
-        writer = csv.writer(response)
-        writer.writerow(["Beneficiário", "Data de nascimento", "Idade", "Família"])
-        today = dt.today()
-        qs = Beneficiary.objects.filter(organization=org, birth_date__isnull=False)
-        for b in qs:
-            age = today.year - b.birth_date.year - ((today.month, today.day) < (b.birth_date.month, b.birth_date.day))
-            if age < 18:
-                fam_link = b.family_links.first()
-                fam_name = fam_link.family.name if fam_link else ""
-                writer.writerow([b.name, b.birth_date, age, fam_name])
-        return response
-    
-    # CSV de eventos/presenças
-    if request.GET.get("download") == "events_csv":
+    # Downloads CSV em streaming (ver panel.exports)
+    download = request.GET.get("download")
+    if download in REPORT_EXPORTS:
         if not (request.user.is_superuser or request.user.role in {User.Role.ADMIN, User.Role.MANAGER}):
             messages.error(request, "Acesso negado ao download.")
             return redirect("panel:reports_page")
-        import csv
-        from django.http import HttpResponse
-        
-        response = HttpResponse(content_type="text/csv; charset=utf-8")
-        response["Content-Disposition"] = 'attachment; filename="eventos_presencas.csv"'
-        response.write("\ufeff")
-        
-        writer = csv.writer(response)
-        writer.writerow(["Evento", "Data", "ID", "Participante", "Identificador", "Status"])
-        
-        events_data = Event.objects.all().order_by("-date")
-        for event in events_data:
-            attendances = Attendance.objects.filter(event=event).select_related("beneficiary").prefetch_related(
-                "beneficiary__family_links__family__members__beneficiary"
-            )
-            for attendance in attendances:
-                # Usar a mesma lógica dos filtros
-                identification = attendance.beneficiary.identifier or attendance.beneficiary.document or f"ID: #{attendance.beneficiary.id}"
-                if not attendance.beneficiary.identifier and not attendance.beneficiary.document and attendance.beneficiary.birth_date:
-                    from datetime import date as dt
-                    today = dt.today()
-                    age = today.year - attendance.beneficiary.birth_date.year - (
-                        (today.month, today.day) < (attendance.beneficiary.birth_date.month, attendance.beneficiary.birth_date.day)
-                    )
-                    if age < 18:
-                        # Buscar responsável
-                        for family_link in attendance.beneficiary.family_links.all():
-                            if family_link.family:
-                                for member in family_link.family.members.all():
-                                    if member.is_guardian and member.beneficiary.identifier:
-                                        identification = f"Resp: {member.beneficiary.identifier}"
-                                        break
-                                break
-                
-                writer.writerow([
-                    event.name,
-                    event.date.strftime("%d/%m/%Y"),
-                    attendance.beneficiary.id,
-                    attendance.beneficiary.name,
-                    identification,
-                    "Presente" if attendance.present else "Ausente",
-                ])
-        
-        return response
+        return REPORT_EXPORTS[download].response(org, compress=request.GET.get("compress") == "gz")
 
     # Tabelas na tela com filtros melhorados
     dist_qs = Distribution.objects.select_related("beneficiary", "product", "organization").order_by("-delivered_at")
@@ -1110,44 +1113,19 @@ def reports_page(request):
     end = request.GET.get("end")
     organization_filter = request.GET.get("organization")
     event_filter = request.GET.get("event")
-    selected_org = None
-    if organization_filter:
-        try:
-            selected_org = Organization.objects.get(id=organization_filter)
-        except Organization.DoesNotExist:
-            selected_org = None
-    
-    # Aplicar filtros
-    if filter_type == "cpf" and filter_value:
-        dist_qs = dist_qs.filter(beneficiary__identifier__icontains=filter_value)
-    elif filter_type == "name" and filter_value:
-        dist_qs = dist_qs.filter(beneficiary__name__icontains=filter_value)
-    elif filter_type == "id" and filter_value:
-        try:
-            dist_qs = dist_qs.filter(beneficiary__id=int(filter_value))
-        except ValueError:
-            pass
-    elif filter_type == "org":
-        dist_qs = dist_qs.filter(organization=org)
-    elif filter_type == "events" and filter_value:
-        # Filtrar beneficiários que participaram de eventos
-        beneficiaries_in_events = Attendance.objects.filter(
-            event__name__icontains=filter_value
-        ).values_list('beneficiary_id', flat=True)
-        dist_qs = dist_qs.filter(beneficiary_id__in=beneficiaries_in_events)
+    selected_org = get_organization(organization_filter) if organization_filter else None
     
-    if organization_filter:
-        dist_qs = dist_qs.filter(organization_id=organization_filter)
-    if event_filter:
-        # Filtrar por evento específico
-        beneficiaries_in_event = Attendance.objects.filter(
-            event_id=event_filter
-        ).values_list('beneficiary_id', flat=True)
-        dist_qs = dist_qs.filter(beneficiary_id__in=beneficiaries_in_event)
-    if start:
-        dist_qs = dist_qs.filter(delivered_at__date__gte=start)
-    if end:
-        dist_qs = dist_qs.filter(delivered_at__date__lte=end)
+    # Aplicar filtros (ver panel.reports: intervalos e subconsultas que usam índices)
+    dist_qs = filter_distributions(
+        dist_qs,
+        org=org,
+        filter_type=filter_type,
+        filter_value=filter_value,
+        organization_filter=organization_filter,
+        event_filter=event_filter,
+        start=start,
+        end=end,
+    )
     
     dist_qs = dist_qs[:200]
 
@@ -1163,7 +1141,7 @@ def reports_page(request):
     else:
         families = Family.objects.all().prefetch_related("members__beneficiary")[:50]
 
-    organizations = Organization.objects.all().order_by("name")
+    organizations = list_organizations()
 
     # Eventos: restringir à organização escolhida ou à ONG ativa; admin global sem filtro vê todos
     if selected_org is not None:
@@ -1173,7 +1151,10 @@ def reports_page(request):
     else:
         events = Event.objects.all().order_by("-date")
     
+    report_jobs = ReportJob.objects.filter(user=request.user).order_by("-created_at")[:10]
+
     return render(request, "panel/reports.html", {
+        "report_jobs": report_jobs,
         "distributions": dist_qs, 
         "families": families,
         "organizations": organizations,
@@ -1187,6 +1168,120 @@ def reports_page(request):
     })
 
 
+@login_required
+@require_manager_or_admin
+def distribution_pivot_report(request):
+    """Quantidade de entregas por ONG × produto × mês (HTML ou ?format=json)."""
+    from django.http import JsonResponse
+    from core.analytics import distribution_pivot, month_range
+
+    def _month(value):
+        try:
+            return date.fromisoformat(f"{value}-01") if value else None
+        except ValueError:
+            return None
+
+    org = get_active_organization(request)
+    current_month = timezone.localdate().replace(day=1)
+    end = _month(request.GET.get("end")) or current_month
+    # Padrão: últimos 12 meses até `end`
+    start = _month(request.GET.get("start")) or date(end.year - (end.month < 12), end.month % 12 + 1, 1)
+    if start > end:
+        start, end = end, start
+    months = month_range(start, end)[-PIVOT_MAX_MONTHS:]
+
+    pivot = distribution_pivot(months, organization=org)
+    if request.GET.get("format") == "json":
+        return JsonResponse(pivot)
+    return render(request, "panel/distribution_pivot.html", {
+        "pivot": pivot,
+        "org": org,
+        "start": months[0].strftime("%Y-%m"),
+        "end": months[-1].strftime("%Y-%m"),
+    })
+
+
+@login_required
+@require_manager_or_admin
+def report_job_create(request):
+    """Enfileira uma exportação para o run_report_worker."""
+    if request.method != "POST":
+        return HttpResponseBadRequest("Método inválido")
+    org = get_active_organization(request)
+    kind = request.POST.get("kind")
+    try:
+        job = enqueue_report(request.user, org, kind, compress=request.POST.get("compress") == "gz")
+    except ValueError as exc:
+        messages.error(request, str(exc))
+        return redirect("panel:reports_page")
+    log_action(request.user, request, "report_job_create", model_name="ReportJob", object_id=job.id, description=kind, organization=org)
+    messages.success(request, "Exportação solicitada. O arquivo ficará disponível abaixo quando estiver pronto.")
+    return redirect("panel:reports_page")
+
+
+@login_required
+@require_manager_or_admin
+def report_job_download(request, pk: int):
+    from django.http import FileResponse
+
+    if request.user.is_superuser:
+        job = get_object_or_404(ReportJob, pk=pk)
+    else:
+        job = get_object_or_404(ReportJob, pk=pk, user=request.user)
+    path = job_path(job)
+    if not job.is_ready or not path.exists():
+        messages.error(request, "Arquivo indisponível ou expirado.")
+        return redirect("panel:reports_page")
+    filename = REPORT_EXPORTS[job.kind].filename + (".gz" if job.compress else "")
+    return FileResponse(open(path, "rb"), as_attachment=True, filename=filename)
+
+
+@login_required
+@require_manager_or_admin
+def attendance_report(request):
+    """Taxas de presença, desistências e coortes da organização ativa."""
+    from django.core.paginator import Paginator
+    from core.analytics import get_attendance_matrix
+
+    org = get_active_organization(request)
+    try:
+        min_absences = max(1, int(request.GET.get("min_absences") or 3))
+    except ValueError:
+        min_absences = 3
+
+    matrix = get_attendance_matrix(org)
+    recent_months = matrix.months[-6:]
+
+    stats = matrix.beneficiary_stats()
+    stats.sort(key=lambda item: (item["rate"] is None, item["rate"] or 0, item["beneficiary_id"]))
+    page_obj = Paginator(stats, 50).get_page(request.GET.get("page"))
+    dropouts = matrix.dropouts(min_absences)
+
+    # Nomes apenas para as linhas exibidas
+    shown_ids = [item["beneficiary_id"] for item in page_obj.object_list] + [item["beneficiary_id"] for item in dropouts[:100]]
+    names = dict(Beneficiary.objects.filter(id__in=shown_ids).values_list("id", "name"))
+    index = {bid: i for i, bid in enumerate(matrix.beneficiary_ids)}
+    rows = []
+    for item in page_obj.object_list:
+        monthly = matrix.monthly_rates(index[item["beneficiary_id"]])
+        rows.append({**item, "name": names.get(item["beneficiary_id"], ""), "months": [monthly.get(m) for m in recent_months]})
+    for item in dropouts[:100]:
+        item["name"] = names.get(item["beneficiary_id"], "")
+
+    return render(request, "panel/attendance_report.html", {
+        "org": org,
+        "rows": rows,
+        "page_obj": page_obj,
+        "recent_months": recent_months,
+        "month_totals": matrix.month_totals(),
+        "cohorts": matrix.cohorts(),
+        "dropouts": dropouts[:100],
+        "dropouts_total": len(dropouts),
+        "min_absences": min_absences,
+        "total_events": len(matrix.events),
+    })
+
+
 @login_required
 def family_list(request):
     org = get_active_organization(request)
@@ -1255,8 +1350,12 @@ def family_list(request):
             'has_guardian': has_guardian,
             'has_minor': has_minor,
         })
+    versions = row_versions(FAMILY, [detail['family'].pk for detail in family_details])
+    for detail in family_details:
+        detail['row_version'] = versions[detail['family'].pk]
     
     context = {
+        **row_cache_context(),
         "families": families,
         "family_details": family_details,
         "total_families": total_families,
@@ -1330,28 +1429,52 @@ def event_summary(request, pk):
     org = get_active_organization(request)
     event = get_object_or_404(Event, pk=pk, organization=org)
     
-    # Presenças do evento com dados de família
-    attendances = Attendance.objects.filter(event=event).select_related(
-        "beneficiary"
-    ).prefetch_related(
-        "beneficiary__family_links__family__members__beneficiary"
+    from django.core.paginator import Paginator
+    from django.db.models import Count, Q
+
+    attendances = Attendance.objects.filter(event=event)
+
+    # Estatísticas em uma única agregação
+    stats = attendances.aggregate(
+        total_count=Count("id"),
+        present_count=Count("id", filter=Q(present=True)),
+        absent_count=Count("id", filter=Q(present=False)),
     )
-    total_attendances = attendances.count()
-    
-    # Estatísticas
-    present_count = attendances.filter(present=True).count()
-    absent_count = attendances.filter(present=False).count()
-    
+
+    # Lista paginada: o prefetch de família só roda para as linhas da página
+    paginator = Paginator(
+        attendances.select_related("beneficiary")
+        .prefetch_related("beneficiary__family_links__family__members__beneficiary")
+        .order_by("beneficiary__name", "id"),
+        EVENT_SUMMARY_PAGE_SIZE,
+    )
+    page_obj = paginator.get_page(request.GET.get("page"))
+
     context = {
         "event": event,
-        "attendances": attendances,
-        "total_attendances": total_attendances,
-        "present_count": present_count,
-        "absent_count": absent_count,
+        "attendances": page_obj.object_list,
+        "page_obj": page_obj,
+        "total_attendances": stats["total_count"],
+        "present_count": stats["present_count"],
+        "absent_count": stats["absent_count"],
     }
     return render(request, "panel/event_summary.html", context)
 
 
+@login_required
+def event_summary_csv(request, pk):
+    """CSV de participantes de um evento, gerado em streaming."""
+    from django.utils.text import slugify
+
+    org = get_active_organization(request)
+    event = get_object_or_404(Event, pk=pk, organization=org)
+    return stream_csv(
+        f"participantes_{slugify(event.name)}.csv",
+        ["ID", "Nome", "Identificador", "Idade", "Status"],
+        event_attendance_rows(event),
+    )
+
+
 @login_required
 @require_manager_or_admin
 def event_create(request):
@@ -1,4 +1,5 @@
 import os
+from importlib.util import find_spec
 from pathlib import Path
 from dotenv import load_dotenv
 import dj_database_url
@@ -34,6 +35,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Compacta as respostas de /api/ quando o cliente aceita gzip
+    "api.middleware.ApiGZipMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -112,17 +115,121 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # Token primeiro: sem cabeçalho ele não faz nada, e um 401 leva "WWW-Authenticate: Token"
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        "api.authentication.ApiTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.BasicAuthentication",
     ],
+    # orjson quando instalado (ver api.renderers); MessagePack só com o pacote msgpack
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+        *(["api.renderers.MessagePackRenderer"] if find_spec("msgpack") else []),
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+        *(["api.renderers.MessagePackParser"] if find_spec("msgpack") else []),
+    ],
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.ApiCursorPagination",
+    "PAGE_SIZE": 50,
+    # Baldes de fichas por usuário e por ONG (ver api.throttles); `deliver` tem um balde próprio
+    "DEFAULT_THROTTLE_CLASSES": [
+        "api.throttles.UserTokenBucketThrottle",
+        "api.throttles.OrganizationTokenBucketThrottle",
+    ],
+}
+
+# Tokens da API (core.tokens): tempo da verificação em cache e validade sugerida no painel
+API_TOKEN_CACHE_TTL = int(os.getenv("API_TOKEN_CACHE_TTL", "300"))
+API_TOKEN_DEFAULT_DAYS = int(os.getenv("API_TOKEN_DEFAULT_DAYS", "90"))
+
+# Limites da API: `rate` é o reabastecimento ("N/s|min|hour|day") e `burst` a capacidade do balde,
+# somando todos os workers. Com Redis os baldes são compartilhados; sem ele, cada worker aplica
+# a sua fração (divisão por API_THROTTLE_WORKERS; ver api.throttles)
+API_THROTTLE_WORKERS = int(os.getenv("API_THROTTLE_WORKERS", os.getenv("WEB_CONCURRENCY", "3")))
+API_THROTTLE_BUCKETS = {
+    "user": {
+        "rate": os.getenv("API_THROTTLE_USER_RATE", "120/min"),
+        "burst": int(os.getenv("API_THROTTLE_USER_BURST", "60")),
+    },
+    "org": {
+        "rate": os.getenv("API_THROTTLE_ORG_RATE", "600/min"),
+        "burst": int(os.getenv("API_THROTTLE_ORG_BURST", "200")),
+    },
+    "deliver": {
+        "rate": os.getenv("API_THROTTLE_DELIVER_RATE", "30/min"),
+        "burst": int(os.getenv("API_THROTTLE_DELIVER_BURST", "10")),
+    },
 }
 
 # Sessão: expirar por inatividade em 5 minutos
 SESSION_COOKIE_AGE = 300  # segundos
 SESSION_SAVE_EVERY_REQUEST = True  # renova a expiração a cada requisição
+# Cache + banco, gravando só quando os dados mudam ou a cada N segundos (ver core.sessions)
+SESSION_ENGINE = "core.sessions"
+SESSION_REFRESH_SECONDS = int(os.getenv("SESSION_REFRESH_SECONDS", "60"))
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
 
+# Cache compartilhado entre os workers do gunicorn. Com REDIS_URL, Redis; senão arquivo local
+# com limpeza espaçada (core.cache: o FileBasedCache do Django varre o diretório a cada set()).
+# DJANGO_CACHE_BACKEND/DJANGO_CACHE_LOCATION permitem trocar, ex.: LocMemCache nos testes
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    _default_cache = {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL}
+else:
+    _default_cache = {
+        "BACKEND": "core.cache.FileBasedCache",
+        "LOCATION": str(BASE_DIR / "media" / "cache"),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("DJANGO_CACHE_MAX_ENTRIES", "10000")),
+            "CULL_INTERVAL": int(os.getenv("DJANGO_CACHE_CULL_INTERVAL", "60")),
+        },
+    }
+_default_cache["BACKEND"] = os.getenv("DJANGO_CACHE_BACKEND", _default_cache["BACKEND"])
+_default_cache["LOCATION"] = os.getenv("DJANGO_CACHE_LOCATION", _default_cache["LOCATION"])
+CACHES = {
+    "default": _default_cache,
+    # Fragmentos de linhas das listagens do painel (panel.fragments): memória de cada worker;
+    # as versões das linhas ficam no cache padrão
+    "fragments": {
+        "BACKEND": os.getenv("FRAGMENT_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("FRAGMENT_CACHE_LOCATION", "panel-fragments"),
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("FRAGMENT_CACHE_MAX_ENTRIES", "20000"))},
+    },
+}
+PANEL_FRAGMENT_CACHE_TTL = int(os.getenv("PANEL_FRAGMENT_CACHE_TTL", "3600"))
+
+# Relatório de presenças: tempo máximo da matriz em cache (invalidada a cada alteração)
+ATTENDANCE_ANALYTICS_CACHE_TTL = int(os.getenv("ATTENDANCE_ANALYTICS_CACHE_TTL", "600"))
+
+# Exportações em segundo plano (manage.py run_report_worker)
+REPORTS_STORAGE_DIR = Path(os.getenv("REPORTS_STORAGE_DIR", BASE_DIR / "media" / "reports"))
+REPORT_JOB_TTL_HOURS = int(os.getenv("REPORT_JOB_TTL_HOURS", "24"))
+# O worker renova o heartbeat do job a cada N segundos; job em RUNNING sem renovação há mais
+# de REPORT_JOB_STALE_MINUTES é dado como interrompido (worker caiu) e marcado como FAILED
+REPORT_JOB_HEARTBEAT_SECONDS = int(os.getenv("REPORT_JOB_HEARTBEAT_SECONDS", "30"))
+REPORT_JOB_STALE_MINUTES = int(os.getenv("REPORT_JOB_STALE_MINUTES", "10"))
+
+# Heartbeat de UserSession: no máximo uma escrita por sessão a cada N segundos,
+# gravadas em lote (ver core.heartbeat)
+USER_SESSION_HEARTBEAT_SECONDS = int(os.getenv("USER_SESSION_HEARTBEAT_SECONDS", "60"))
+USER_SESSION_FLUSH_SECONDS = int(os.getenv("USER_SESSION_FLUSH_SECONDS", "10"))
+# Histórico de UserSession mantido pelo reap_sessions (em dias)
+USER_SESSION_RETENTION_DAYS = int(os.getenv("USER_SESSION_RETENTION_DAYS", "90"))
+
+# Auditoria gravada em lote fora da request (ver core.audit); False grava na hora
+AUDIT_LOG_ASYNC = os.getenv("AUDIT_LOG_ASYNC", "True").lower() in ("1", "true", "yes", "on")
+AUDIT_LOG_FLUSH_SECONDS = float(os.getenv("AUDIT_LOG_FLUSH_SECONDS", "2"))
+AUDIT_LOG_BUFFER_SIZE = int(os.getenv("AUDIT_LOG_BUFFER_SIZE", "500"))
+# Retenção da auditoria no banco; o excedente vai para AUDIT_ARCHIVE_DIR (archive_audit_logs)
+AUDIT_LOG_RETENTION_DAYS = int(os.getenv("AUDIT_LOG_RETENTION_DAYS", "365"))
+AUDIT_ARCHIVE_DIR = Path(os.getenv("AUDIT_ARCHIVE_DIR", BASE_DIR / "media" / "audit"))
+
+# Diretório de organizações em cache (ver core.directory)
+ORGANIZATION_CACHE_TTL = int(os.getenv("ORGANIZATION_CACHE_TTL", "60"))
+
 LOGIN_URL = "login"
 LOGIN_REDIRECT_URL = "dashboard"
 LOGOUT_REDIRECT_URL = "login"
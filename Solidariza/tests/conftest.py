@@ -0,0 +1,81 @@
+from datetime import date
+
+import pytest
+from django.test import Client
+
+from accounts.models import User
+from core.models import Beneficiary, Distribution, Organization, OrganizationBeneficiary, Product
+
+
+@pytest.fixture(autouse=True)
+def _local_cache(settings):
+    """Cache em memória, vazio a cada teste (o padrão grava em media/cache)."""
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "tests-default"},
+        "fragments": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "tests-fragments"},
+    }
+    from django.core.cache import caches
+
+    for alias in settings.CACHES:
+        caches[alias].clear()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_throttle_buckets():
+    """Os baldes do throttle ficam na memória do processo; cada teste começa com eles cheios."""
+    from api import throttles
+
+    throttles._local_buckets.clear()
+
+
+@pytest.fixture
+def organization(db):
+    return Organization.objects.create(name="ONG A")
+
+
+@pytest.fixture
+def admin_user(organization):
+    return User.objects.create_superuser(username="admin", password="x", organization=organization, role="ADMIN")
+
+
+@pytest.fixture
+def client_admin(admin_user, organization):
+    client = Client()
+    client.force_login(admin_user)
+    session = client.session
+    session["active_organization_id"] = organization.id
+    session.save()
+    return client
+
+
+@pytest.fixture
+def make_beneficiaries(organization):
+    def make(count, start=0):
+        beneficiaries = Beneficiary.objects.bulk_create(
+            Beneficiary(name=f"Pessoa {i}", identifier=f"ID{i:05d}") for i in range(start, start + count)
+        )
+        OrganizationBeneficiary.objects.bulk_create(
+            OrganizationBeneficiary(organization=organization, beneficiary=b) for b in beneficiaries
+        )
+        return beneficiaries
+
+    return make
+
+
+@pytest.fixture
+def make_distributions(organization, admin_user, make_beneficiaries):
+    product = Product.objects.create(organization=organization, name="Cesta", is_bundle=True)
+
+    def make(count, start=0):
+        return Distribution.objects.bulk_create(
+            Distribution(
+                organization=organization,
+                beneficiary=b,
+                product=product,
+                period_month=date(2025, 5, 1),
+                delivered_by=admin_user,
+            )
+            for b in make_beneficiaries(count, start)
+        )
+
+    return make
@@ -0,0 +1,20 @@
+"""GET condicional da API: só ETag, que muda quando um vínculo é removido."""
+
+from core.models import OrganizationBeneficiary
+
+
+def test_unlink_changes_etag(client_admin, make_beneficiaries):
+    beneficiaries = make_beneficiaries(5)
+    response = client_admin.get("/api/beneficiaries/")
+    assert not response.has_header("Last-Modified")
+    etag = response["ETag"]
+    assert client_admin.get("/api/beneficiaries/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    OrganizationBeneficiary.objects.filter(beneficiary=beneficiaries[-1]).delete()
+    assert client_admin.get("/api/beneficiaries/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_if_modified_since_is_ignored(client_admin, make_beneficiaries):
+    make_beneficiaries(3)
+    response = client_admin.get("/api/beneficiaries/", HTTP_IF_MODIFIED_SINCE="Wed, 21 Oct 2099 07:28:00 GMT")
+    assert response.status_code == 200
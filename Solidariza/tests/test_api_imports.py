@@ -0,0 +1,37 @@
+"""Resumo da importação em massa: conta só o que foi gravado."""
+
+import json
+
+from api import imports
+from core.models import Beneficiary, Organization, OrganizationBeneficiary
+
+
+def _post(client, records):
+    body = "\n".join(r if isinstance(r, str) else json.dumps(r) for r in records)
+    return client.post("/api/beneficiaries/import/", data=body, content_type="application/x-ndjson").json()
+
+
+def test_created_and_linked_counts(client_admin, make_beneficiaries):
+    [linked_here] = make_beneficiaries(1)
+    elsewhere = Beneficiary.objects.create(name="Outra ONG", identifier="XYZ999")
+    OrganizationBeneficiary.objects.create(organization=Organization.objects.create(name="ONG B"), beneficiary=elsewhere)
+    records = [
+        {"name": "Nova", "identifier": "NEW1"},
+        {"name": linked_here.name, "identifier": linked_here.identifier},
+        {"name": elsewhere.name, "identifier": elsewhere.identifier},
+    ]
+
+    summary = _post(client_admin, records)
+    assert (summary["created"], summary["linked"], summary["error_count"]) == (1, 1, 0)
+
+    # reimportar o mesmo arquivo não cria nem vincula nada
+    summary = _post(client_admin, records)
+    assert (summary["created"], summary["linked"]) == (0, 0)
+
+
+def test_errors_are_capped(client_admin, monkeypatch):
+    monkeypatch.setattr(imports, "IMPORT_MAX_ERRORS", 5)
+    summary = _post(client_admin, ["{inválido"] * 8)
+    assert summary["error_count"] == 8
+    assert summary["errors_truncated"] is True
+    assert len(summary["errors"]) == 5
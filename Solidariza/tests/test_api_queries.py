@@ -0,0 +1,90 @@
+"""Número de consultas das listagens da API: fixo, qualquer que seja o volume ou a página."""
+
+from datetime import date
+
+import pytest
+
+from core.models import Attendance, Event
+
+# Consultas por requisição com a sessão já em cache:
+# usuário + carimbo do ETag (COUNT/MAX) + página do cursor
+QUERIES = {
+    "beneficiaries": 3,
+    "distributions": 3,
+    # usuário + organização; a matriz vem do cache
+    "attendance_cached": 2,
+}
+
+
+def _pages(client, url):
+    """Percorre todas as páginas do cursor e devolve as URLs visitadas."""
+    urls = []
+    while url:
+        urls.append(url)
+        url = client.get(url).json()["next"]
+    return urls
+
+
+@pytest.mark.parametrize("count", [3, 120])
+def test_beneficiary_list_queries(client_admin, make_beneficiaries, django_assert_num_queries, count):
+    make_beneficiaries(count)
+    client_admin.get("/api/beneficiaries/")  # sessão e usuário em cache
+    with django_assert_num_queries(QUERIES["beneficiaries"]):
+        response = client_admin.get("/api/beneficiaries/?page_size=50")
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == min(count, 50)
+
+
+def test_beneficiary_list_later_pages_same_queries(client_admin, make_beneficiaries, django_assert_num_queries):
+    make_beneficiaries(120)
+    for url in _pages(client_admin, "/api/beneficiaries/?page_size=50"):
+        with django_assert_num_queries(QUERIES["beneficiaries"]):
+            assert client_admin.get(url).status_code == 200
+
+
+@pytest.mark.parametrize("count", [3, 120])
+def test_distribution_list_queries(client_admin, make_distributions, django_assert_num_queries, count):
+    make_distributions(count)
+    client_admin.get("/api/distributions/")
+    with django_assert_num_queries(QUERIES["distributions"]):
+        response = client_admin.get("/api/distributions/?page_size=50")
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == min(count, 50)
+
+
+def test_distribution_list_expanded_beneficiary_no_extra_queries(client_admin, make_distributions, django_assert_num_queries):
+    make_distributions(60)
+    client_admin.get("/api/distributions/")
+    with django_assert_num_queries(QUERIES["distributions"]):
+        response = client_admin.get("/api/distributions/?page_size=50&expand=beneficiary")
+    assert all(isinstance(item["beneficiary"], dict) for item in response.json()["results"])
+
+
+def test_distribution_list_later_pages_same_queries(client_admin, make_distributions, django_assert_num_queries):
+    make_distributions(120)
+    for url in _pages(client_admin, "/api/distributions/?page_size=50"):
+        with django_assert_num_queries(QUERIES["distributions"]):
+            assert client_admin.get(url).status_code == 200
+
+
+def test_attendance_analytics_cached(client_admin, make_beneficiaries, django_assert_num_queries):
+    make_beneficiaries(30)
+    client_admin.get("/api/analytics/attendance/")
+    with django_assert_num_queries(QUERIES["attendance_cached"]):
+        assert client_admin.get("/api/analytics/attendance/").status_code == 200
+
+
+
+def test_attendance_analytics_pages_dropouts(client_admin, organization, make_beneficiaries):
+    beneficiaries = make_beneficiaries(5)
+    events = [Event.objects.create(organization=organization, name="Oficina", date=date(2025, m, 1)) for m in range(1, 5)]
+    # todos vieram no primeiro evento e faltaram aos três seguintes
+    Attendance.objects.bulk_create(
+        Attendance(event=event, beneficiary=b, present=event is events[0]) for event in events for b in beneficiaries
+    )
+    first = client_admin.get("/api/analytics/attendance/?limit=2").json()
+    assert first["dropout_count"] == 5 and len(first["dropouts"]) == 2
+    assert first["dropouts_next_offset"] == 2
+    last = client_admin.get("/api/analytics/attendance/?limit=2&dropouts_offset=4").json()
+    assert len(last["dropouts"]) == 1 and last["dropouts_next_offset"] is None
+    assert first["cohort_count"] == 1 and first["cohorts_next_offset"] is None
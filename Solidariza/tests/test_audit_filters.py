@@ -0,0 +1,17 @@
+"""Filtro de usuário da auditoria: login numérico não é confundido com id."""
+
+from accounts.models import User
+from core.models import AuditLog
+from panel.audit import filter_audit_logs
+
+
+def test_numeric_username_matches_login_and_id(admin_user, organization):
+    numeric = User.objects.create_user(username=str(admin_user.pk + 1000), password="x", organization=organization)
+    AuditLog.objects.create(user=numeric, action="update", model_name="Beneficiary", object_id="7")
+    AuditLog.objects.create(user=admin_user, action="update", model_name="Product", object_id="7")
+    logs = AuditLog.objects.all()
+
+    assert list(filter_audit_logs(logs, user=numeric.username).values_list("user_id", flat=True)) == [numeric.pk]
+    assert list(filter_audit_logs(logs, user=str(admin_user.pk)).values_list("user_id", flat=True)) == [admin_user.pk]
+    assert filter_audit_logs(logs, user="admin").count() == 1
+    assert filter_audit_logs(logs, object_id="7").count() == 2
@@ -0,0 +1,73 @@
+"""Change feed (/api/sync/): ordem de confirmação, sem pular transações que terminam depois."""
+
+import threading
+
+import pytest
+from django.db import connection, connections, transaction
+
+from core import changes
+from core.changes import BENEFICIARY, changes_since, record_changes
+from core.models import ChangeLog
+
+
+def _ids(feed):
+    return feed["changed"][BENEFICIARY]
+
+
+def test_late_commit_is_not_skipped(organization, monkeypatch):
+    """A transação 105 reservou o id menor mas confirma depois da 110."""
+    horizon = {"value": 105}
+    monkeypatch.setattr(changes, "_visible_txid_horizon", lambda: horizon["value"])
+    early = ChangeLog.objects.create(organization=organization, model_name=BENEFICIARY, object_id=1, txid=105)
+    ChangeLog.objects.create(organization=organization, model_name=BENEFICIARY, object_id=2, txid=110)
+    # 105 ainda aberta: nada dela nem depois dela é entregue
+    early.delete()
+
+    feed = changes_since(organization.id, "0")
+    assert _ids(feed) == []
+
+    ChangeLog.objects.create(id=early.id, organization=organization, model_name=BENEFICIARY, object_id=1, txid=105)
+    horizon["value"] = 111
+    feed = changes_since(organization.id, feed["cursor"])
+    assert _ids(feed) == [1, 2]
+
+
+# fora da transação do teste: no PostgreSQL, a própria transação aberta ainda não entra no feed
+@pytest.mark.django_db(transaction=True)
+def test_cursor_pages_follow_commit_order(organization):
+    record_changes([organization.id], BENEFICIARY, [1, 2, 3])
+    first = changes_since(organization.id, "0", limit=2)
+    assert (_ids(first), first["has_more"]) == ([1, 2], True)
+    rest = changes_since(organization.id, first["cursor"], limit=2)
+    assert (_ids(rest), rest["has_more"]) == ([3], False)
+    assert changes_since(organization.id, rest["cursor"])["changed"][BENEFICIARY] == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_open_transaction_is_delivered_after_commit_postgresql(organization):
+    if connection.vendor != "postgresql":
+        pytest.skip("ordem por txid só existe no PostgreSQL")
+    inserted, release = threading.Event(), threading.Event()
+
+    def slow_writer():
+        try:
+            with transaction.atomic():
+                record_changes([organization.id], BENEFICIARY, [1])
+                inserted.set()
+                release.wait(10)
+        finally:
+            connections.close_all()
+
+    writer = threading.Thread(target=slow_writer)
+    writer.start()
+    inserted.wait(10)
+    # confirmada depois do início da lenta, com id maior
+    record_changes([organization.id], BENEFICIARY, [2])
+
+    feed = changes_since(organization.id, "0")
+    assert _ids(feed) == []
+
+    release.set()
+    writer.join()
+    feed = changes_since(organization.id, feed["cursor"])
+    assert _ids(feed) == [1, 2]
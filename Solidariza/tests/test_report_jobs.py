@@ -0,0 +1,40 @@
+"""Jobs de exportação: interrompido é quem parou de renovar o heartbeat, não quem começou há muito."""
+
+from datetime import timedelta
+
+from django.utils import timezone
+
+from core.models import ReportJob
+from panel import jobs
+from panel.exports import REPORT_EXPORTS
+
+
+def _running(user, organization, *, started, heartbeat):
+    job = jobs.enqueue_report(user, organization, next(iter(REPORT_EXPORTS)))
+    ReportJob.objects.filter(pk=job.pk).update(status=ReportJob.Status.RUNNING, started_at=started, heartbeat_at=heartbeat)
+    return job
+
+
+def test_long_running_job_with_heartbeat_is_kept(admin_user, organization, settings, tmp_path):
+    settings.REPORTS_STORAGE_DIR = tmp_path
+    now = timezone.now()
+    alive = _running(admin_user, organization, started=now - timedelta(hours=3), heartbeat=now)
+    dead = _running(admin_user, organization, started=now - timedelta(hours=3), heartbeat=now - timedelta(hours=1))
+
+    assert jobs.fail_stale_jobs() == 1
+    assert ReportJob.objects.get(pk=alive.pk).status == ReportJob.Status.RUNNING
+    assert ReportJob.objects.get(pk=dead.pk).status == ReportJob.Status.FAILED
+
+
+def test_run_job_renews_heartbeat(admin_user, organization, make_beneficiaries, settings, tmp_path):
+    settings.REPORTS_STORAGE_DIR = tmp_path
+    settings.REPORT_JOB_HEARTBEAT_SECONDS = 0
+    make_beneficiaries(5)
+    jobs.enqueue_report(admin_user, organization, next(iter(REPORT_EXPORTS)))
+    job = jobs.claim_next_job()
+    ReportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+
+    jobs.run_job(job)
+    job.refresh_from_db()
+    assert job.status == ReportJob.Status.DONE
+    assert job.heartbeat_at > timezone.now() - timedelta(minutes=1)
@@ -0,0 +1,40 @@
+"""Baldes do throttle: compartilhados e atômicos no Redis, fração por worker sem ele."""
+
+import pytest
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCacheClient
+
+from api import throttles
+
+
+@pytest.fixture
+def redis_cache(settings, monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    server = fakeredis.FakeServer()
+    # todos os "workers" falam com o mesmo servidor
+    monkeypatch.setattr(RedisCacheClient, "get_client", lambda self, key=None, *, write=False: fakeredis.FakeRedis(server=server))
+    settings.CACHES = {
+        **settings.CACHES,
+        "default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://fake"},
+    }
+    return caches["default"]
+
+
+def test_shared_bucket_counts_every_worker(redis_cache, settings):
+    settings.API_THROTTLE_WORKERS = 3
+    rate, capacity = 1 / 60, 5
+    waits = [throttles.take_token("api_throttle:user:1", rate, capacity, now=100) for _ in range(6)]
+    # capacidade inteira (não a fração de um worker) e nada além dela
+    assert waits[:5] == [0.0] * 5
+    assert waits[5] == pytest.approx(60)
+    assert not throttles._local_buckets
+    assert throttles.take_token("api_throttle:user:1", rate, capacity, now=160) == 0.0
+
+
+def test_local_bucket_is_a_worker_share(settings):
+    settings.API_THROTTLE_WORKERS = 3
+    rate, capacity = 1 / 60, 6
+    waits = [throttles.take_token("api_throttle:user:2", rate, capacity, now=100) for _ in range(3)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] > 0